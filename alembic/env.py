@@ -15,7 +15,7 @@ from app.db.base import Base
 from app.core.config import settings
 
 # Import all models so they are registered with Base.metadata
-from app.models import user  # noqa: F401
+from app.models import user, idempotency, login_event  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,129 @@
+"""swap_in_partitioned_users
+
+Replaces `users` with the backfilled `users_partitioned` in one short
+transaction: renames only, no data is copied while the lock is held. The old
+table stays behind as `users_unpartitioned` (no longer written to) until it is
+dropped by hand. Set USERS_PARTITIONED=true once this is applied.
+
+Revision ID: 5bb3e3f1455c
+Revises: d5c3b19259f2
+Create Date: 2026-10-19 16:14:51.092284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.db.online_migrations import lock_timeout
+from app.db.partition_users import BACKFILL_COMPLETE
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5bb3e3f1455c'
+down_revision: Union[str, Sequence[str], None] = 'd5c3b19259f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index/constraint names on users, and their temporary names on users_partitioned
+RENAMED_INDEXES = {
+    'users_pkey': 'users_partitioned_pkey',
+    'ix_users_reset_token': 'ix_users_partitioned_reset_token',
+    'ix_users_email_trgm': 'ix_users_partitioned_email_trgm',
+    'ix_users_username_trgm': 'ix_users_partitioned_username_trgm',
+    'ix_users_full_name_trgm': 'ix_users_partitioned_full_name_trgm',
+}
+# Only exist on the unpartitioned table; user_lookup enforces them afterwards
+UNIQUE_INDEXES = ('ix_users_email', 'ix_users_username')
+
+
+def _retire_name(name: str) -> str:
+    return name.replace('users', 'users_unpartitioned', 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not op.get_context().as_sql:
+        comment = op.get_bind().execute(
+            text("SELECT obj_description('users_partitioned'::regclass, 'pg_class')")
+        ).scalar()
+        if comment != BACKFILL_COMPLETE:
+            raise RuntimeError(
+                "users_partitioned is not backfilled yet; run `python -m app.db.partition_users` first"
+            )
+
+    with lock_timeout():
+        op.execute('LOCK TABLE users, users_partitioned IN ACCESS EXCLUSIVE MODE')
+        op.execute('DROP TRIGGER users_mirror_to_partitioned ON users')
+        op.execute('DROP FUNCTION users_mirror_to_partitioned()')
+
+        op.execute('ALTER TABLE users RENAME TO users_unpartitioned')
+        op.execute('ALTER TABLE users_unpartitioned RENAME CONSTRAINT users_pkey TO users_unpartitioned_pkey')
+        for name in [*RENAMED_INDEXES, *UNIQUE_INDEXES]:
+            if name != 'users_pkey':
+                op.execute(f'ALTER INDEX {name} RENAME TO {_retire_name(name)}')
+
+        op.execute('ALTER TABLE users_partitioned RENAME TO users')
+        op.execute('ALTER TABLE users RENAME CONSTRAINT users_partitioned_pkey TO users_pkey')
+        for name, temporary in RENAMED_INDEXES.items():
+            if name != 'users_pkey':
+                op.execute(f'ALTER INDEX {temporary} RENAME TO {name}')
+        op.execute('COMMENT ON TABLE users IS NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Not online: bringing the old table up to date scans both tables under lock
+    with lock_timeout():
+        op.execute('LOCK TABLE users, users_unpartitioned IN ACCESS EXCLUSIVE MODE')
+        op.execute('DELETE FROM users_unpartitioned o WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = o.id)')
+        op.execute('''
+            INSERT INTO users_unpartitioned SELECT * FROM users
+            ON CONFLICT (id) DO UPDATE SET
+                email = EXCLUDED.email,
+                username = EXCLUDED.username,
+                full_name = EXCLUDED.full_name,
+                hashed_password = EXCLUDED.hashed_password,
+                reset_token = EXCLUDED.reset_token,
+                reset_token_expires = EXCLUDED.reset_token_expires
+        ''')
+
+        op.execute('ALTER TABLE users RENAME CONSTRAINT users_pkey TO users_partitioned_pkey')
+        for name, temporary in RENAMED_INDEXES.items():
+            if name != 'users_pkey':
+                op.execute(f'ALTER INDEX {name} RENAME TO {temporary}')
+        op.execute('ALTER TABLE users RENAME TO users_partitioned')
+
+        op.execute('ALTER TABLE users_unpartitioned RENAME CONSTRAINT users_unpartitioned_pkey TO users_pkey')
+        for name in [*RENAMED_INDEXES, *UNIQUE_INDEXES]:
+            if name != 'users_pkey':
+                op.execute(f'ALTER INDEX {_retire_name(name)} RENAME TO {name}')
+        op.execute('ALTER TABLE users_unpartitioned RENAME TO users')
+        op.execute(f"COMMENT ON TABLE users_partitioned IS '{BACKFILL_COMPLETE}'")
+
+    # Resume mirroring, as after the previous revision
+    op.execute('''
+        CREATE FUNCTION users_mirror_to_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.id <> OLD.id) THEN
+                DELETE FROM users_partitioned WHERE id = OLD.id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO users_partitioned VALUES (NEW.*)
+                ON CONFLICT (id) DO UPDATE SET
+                    email = EXCLUDED.email,
+                    username = EXCLUDED.username,
+                    full_name = EXCLUDED.full_name,
+                    hashed_password = EXCLUDED.hashed_password,
+                    reset_token = EXCLUDED.reset_token,
+                    reset_token_expires = EXCLUDED.reset_token_expires;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER users_mirror_to_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION users_mirror_to_partitioned()
+    ''')
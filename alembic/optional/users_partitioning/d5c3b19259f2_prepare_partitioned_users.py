@@ -0,0 +1,130 @@
+"""prepare_partitioned_users
+
+Optional branch, applied with
+`alembic --name users_partitioning upgrade users_partitioning@d5c3b19259f2`.
+
+Creates `users_partitioned` (hash-partitioned on id) next to `users` plus the
+`user_lookup` table that keeps email and username globally unique, and starts
+mirroring every write on `users` into the new table. Existing rows are then
+copied with `python -m app.db.partition_users`; the next revision swaps the
+tables. The partition count is fixed here: `-x user_partitions=32` (default 16).
+
+Revision ID: d5c3b19259f2
+Revises: e3a1c7d95b42
+Create Date: 2026-10-19 16:12:08.530617
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+from app.db.online_migrations import lock_timeout
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5c3b19259f2'
+down_revision: Union[str, Sequence[str], None] = 'e3a1c7d95b42'
+branch_labels: Union[str, Sequence[str], None] = ('users_partitioning',)
+depends_on: Union[str, Sequence[str], None] = None
+
+# Built under temporary names; the swap migration renames them to the ix_users_* originals
+PARTITIONED_INDEXES = {
+    'ix_users_partitioned_reset_token': ('reset_token', None),
+    'ix_users_partitioned_email_trgm': ('email', 'gist'),
+    'ix_users_partitioned_username_trgm': ('username', 'gist'),
+    'ix_users_partitioned_full_name_trgm': ('full_name', 'gist'),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partitions = int(context.get_x_argument(as_dictionary=True).get('user_partitions', 16))
+
+    # Same columns, NOT NULLs and defaults (uuid_generate_v7) as users. Unique
+    # indexes on a partitioned table must include the partition key, so
+    # email/username uniqueness moves to user_lookup below.
+    op.execute('CREATE TABLE users_partitioned (LIKE users INCLUDING DEFAULTS) PARTITION BY HASH (id)')
+    op.execute('ALTER TABLE users_partitioned ADD CONSTRAINT users_partitioned_pkey PRIMARY KEY (id)')
+    for remainder in range(partitions):
+        op.execute(
+            f'CREATE TABLE users_p{remainder:03d} PARTITION OF users_partitioned '
+            f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+        )
+    # The table is new and empty, so plain (non-concurrent) builds are instant
+    for index_name, (column, using) in PARTITIONED_INDEXES.items():
+        op.create_index(
+            index_name, 'users_partitioned', [column],
+            postgresql_using=using,
+            postgresql_ops={column: 'gist_trgm_ops'} if using == 'gist' else {},
+        )
+
+    op.execute('''
+        CREATE TABLE user_lookup (
+            user_id uuid PRIMARY KEY,
+            email varchar(255) NOT NULL CONSTRAINT uq_user_lookup_email UNIQUE,
+            username varchar(255) NOT NULL CONSTRAINT uq_user_lookup_username UNIQUE
+        )
+    ''')
+    # A duplicate email/username fails the INSERT into users with the same
+    # unique_violation (IntegrityError) as the old unique indexes did
+    op.execute('''
+        CREATE FUNCTION user_lookup_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_lookup (user_id, email, username) VALUES (NEW.id, NEW.email, NEW.username);
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE user_lookup SET user_id = NEW.id, email = NEW.email, username = NEW.username
+                WHERE user_id = OLD.id;
+            ELSE
+                DELETE FROM user_lookup WHERE user_id = OLD.id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    op.execute('''
+        CREATE TRIGGER users_lookup_sync
+        AFTER INSERT OR DELETE OR UPDATE OF id, email, username ON users_partitioned
+        FOR EACH ROW EXECUTE FUNCTION user_lookup_sync()
+    ''')
+
+    # Upsert rather than update: the row may not have been copied yet
+    op.execute('''
+        CREATE FUNCTION users_mirror_to_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.id <> OLD.id) THEN
+                DELETE FROM users_partitioned WHERE id = OLD.id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO users_partitioned VALUES (NEW.*)
+                ON CONFLICT (id) DO UPDATE SET
+                    email = EXCLUDED.email,
+                    username = EXCLUDED.username,
+                    full_name = EXCLUDED.full_name,
+                    hashed_password = EXCLUDED.hashed_password,
+                    reset_token = EXCLUDED.reset_token,
+                    reset_token_expires = EXCLUDED.reset_token_expires;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    ''')
+    # The only statement that locks the live users table (SHARE ROW EXCLUSIVE,
+    # held until commit), so it runs last and gives up rather than queue
+    # behind a long transaction and block every write to users meanwhile
+    with lock_timeout():
+        op.execute('''
+            CREATE TRIGGER users_mirror_to_partitioned
+            AFTER INSERT OR UPDATE OR DELETE ON users
+            FOR EACH ROW EXECUTE FUNCTION users_mirror_to_partitioned()
+        ''')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with lock_timeout():
+        op.execute('DROP TRIGGER IF EXISTS users_mirror_to_partitioned ON users')
+    op.execute('DROP FUNCTION IF EXISTS users_mirror_to_partitioned()')
+    op.execute('DROP TABLE IF EXISTS users_partitioned CASCADE')
+    op.execute('DROP FUNCTION IF EXISTS user_lookup_sync()')
+    op.execute('DROP TABLE IF EXISTS user_lookup')
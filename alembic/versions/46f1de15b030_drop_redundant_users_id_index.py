@@ -0,0 +1,31 @@
+"""drop_redundant_users_id_index
+
+Revision ID: 46f1de15b030
+Revises: c61f72258d59
+Create Date: 2026-10-19 10:03:47.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '46f1de15b030'
+down_revision: Union[str, Sequence[str], None] = 'c61f72258d59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # users_pkey already indexes id; ix_users_id only costs writes and cache
+    drop_index_concurrently('ix_users_id', 'users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index_concurrently('ix_users_id', 'users', ['id'])
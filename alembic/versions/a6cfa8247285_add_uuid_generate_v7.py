@@ -0,0 +1,54 @@
+"""add_uuid_generate_v7
+
+Revision ID: a6cfa8247285
+Revises: 46f1de15b030
+Create Date: 2026-10-19 11:26:13.904871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6cfa8247285'
+down_revision: Union[str, Sequence[str], None] = '46f1de15b030'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # UUIDv7 built from a random v4 (gen_random_uuid is core since PostgreSQL 13):
+    # overwrite the first 48 bits with the Unix time in ms, then flip the
+    # version nibble from 4 (0100) to 7 (0111) by setting bits 52 and 53
+    op.execute('''
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+    ''')
+
+    # Server-side default for rows inserted outside the ORM (COPY, bulk SQL) and
+    # for USER_ID_SERVER_DEFAULT=true; the ORM normally supplies uuid7() itself.
+    # Changing a column default is a catalog-only change, no table rewrite.
+    op.alter_column('users', 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'id', server_default=None)
+    op.execute('DROP FUNCTION IF EXISTS uuid_generate_v7()')
@@ -0,0 +1,48 @@
+"""add_trigram_search_indexes
+
+Revision ID: c61f72258d59
+Revises: 0613b4db2eb2
+Create Date: 2026-10-19 09:12:04.318522
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61f72258d59'
+down_revision: Union[str, Sequence[str], None] = '0613b4db2eb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = {
+    'ix_users_email_trgm': 'email',
+    'ix_users_username_trgm': 'username',
+    'ix_users_full_name_trgm': 'full_name',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # A plain CREATE INDEX would block writes to users while the GIN index builds
+    for index_name, column in TRGM_INDEXES.items():
+        create_index_concurrently(
+            index_name,
+            'users',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name in TRGM_INDEXES:
+        drop_index_concurrently(index_name, 'users')
@@ -0,0 +1,41 @@
+"""add_login_events_table
+
+Revision ID: d4e4cddf732a
+Revises: d87941ba3218
+Create Date: 2026-10-19 15:02:31.447310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e4cddf732a'
+down_revision: Union[str, Sequence[str], None] = 'd87941ba3218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('login_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('identifier', sa.String(length=255), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('outcome', sa.String(length=32), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_login_events_user_id_created_at', 'login_events', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_login_events_created_at', 'login_events', ['created_at'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_login_events_created_at', table_name='login_events')
+    op.drop_index('ix_login_events_user_id_created_at', table_name='login_events')
+    op.drop_table('login_events')
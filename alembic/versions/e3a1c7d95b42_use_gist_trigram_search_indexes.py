@@ -0,0 +1,57 @@
+"""use_gist_trigram_search_indexes
+
+Rebuilds the trigram search indexes as GiST so user search can take its
+candidates nearest-first (`ORDER BY column <-> query`), which GIN cannot serve.
+GiST trigram indexes still serve the ILIKE filters.
+
+Revision ID: e3a1c7d95b42
+Revises: d4e4cddf732a
+Create Date: 2026-10-19 18:41:27.906114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently, lock_timeout
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a1c7d95b42'
+down_revision: Union[str, Sequence[str], None] = 'd4e4cddf732a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = {
+    'ix_users_email_trgm': 'email',
+    'ix_users_username_trgm': 'username',
+    'ix_users_full_name_trgm': 'full_name',
+}
+
+
+def _rebuild(using: str) -> None:
+    # Build the replacement under a temporary name first, so search never runs
+    # without an index, then give it the original name
+    for index_name, column in TRGM_INDEXES.items():
+        create_index_concurrently(
+            f'{index_name}_new',
+            'users',
+            [column],
+            postgresql_using=using,
+            postgresql_ops={column: f'{using}_trgm_ops'},
+        )
+        drop_index_concurrently(index_name, 'users')
+        with lock_timeout():
+            op.execute(f'ALTER INDEX {index_name}_new RENAME TO {index_name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild('gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild('gin')
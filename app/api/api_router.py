@@ -1,6 +1,7 @@
 from fastapi import APIRouter
-from app.api.v1 import users, auth
+from app.api.v1 import users, auth, admin
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(users.router)
+api_router.include_router(admin.router)
@@ -3,8 +3,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
+from app.core.config import settings
 from app.core.security import decode_access_token
-from app.services.user_service import get_user_by_email
+from app.core.timing import phase
+from app.services.user_service import get_user_by_email_async
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -15,7 +17,9 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
+        # Closing rolls back and returns the connection to the pool (a round trip)
+        with phase("db"):
+            db.close()
 
 
 async def get_current_user(
@@ -37,8 +41,18 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = get_user_by_email(db, email=email)
+    user = await get_user_by_email_async(db, email=email)
     if user is None:
         raise credentials_exception
     
     return user
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Require the current user to be listed in ADMIN_EMAILS."""
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
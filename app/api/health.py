@@ -0,0 +1,28 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from app.services.health_service import readiness
+
+# Mounted at the root, outside /api/v1 and its load-shedding budgets. Both
+# endpoints are async and never touch the database, so they answer even when
+# the threadpool or the connection pool is saturated.
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz", response_model=dict)
+async def healthz():
+    """Liveness: the worker's event loop is serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz", response_model=dict)
+async def readyz():
+    """
+    Readiness: the database answered the latest background check.
+
+    Returns 503 while it is unreachable, before the first check has run, or
+    when checks have stopped, so the load balancer takes the worker out of rotation.
+    """
+    report = readiness.report()
+    if not readiness.is_ready():
+        return JSONResponse(report, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return report
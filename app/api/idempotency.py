@@ -0,0 +1,280 @@
+"""Idempotency-Key support for retried POST requests.
+
+Mark an endpoint with `@idempotent` on a router whose `route_class` is
+`IdempotentRoute`:
+
+    router = APIRouter(prefix="/auth", route_class=IdempotentRoute)
+
+    @router.post("/register")
+    @idempotent
+    def register(...): ...
+
+When a request carries an `Idempotency-Key` header, the first response for
+that key (success or 4xx error) is stored and replayed for later requests
+with the same key and body, without running the endpoint again. Concurrent
+duplicates wait for the first request instead of racing it. Requests without
+the header are unaffected.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import create_db_engine
+from app.services.idempotency_service import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    get_idempotency_record,
+    purge_expired_idempotency_keys,
+    release_idempotency_key,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def idempotent(endpoint: Callable) -> Callable:
+    """Opt an endpoint into Idempotency-Key handling."""
+    endpoint.__idempotent__ = True
+    return endpoint
+
+
+class _StoredResponse:
+    __slots__ = ("request_hash", "status_code", "body", "expires_at")
+
+    def __init__(self, request_hash: str, status_code: int, body: bytes, expires_at: float):
+        self.request_hash = request_hash
+        self.status_code = status_code
+        self.body = body
+        self.expires_at = expires_at
+
+
+class _ResponseCache:
+    """Small per-worker LRU in front of the idempotency_keys table."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[tuple[str, str], _StoredResponse] = OrderedDict()
+
+    def get(self, cache_key: tuple[str, str]) -> _StoredResponse | None:
+        stored = self._items.get(cache_key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            del self._items[cache_key]
+            return None
+        self._items.move_to_end(cache_key)
+        return stored
+
+    def put(self, cache_key: tuple[str, str], stored: _StoredResponse) -> None:
+        if self.max_size <= 0:
+            return
+        self._items[cache_key] = stored
+        self._items.move_to_end(cache_key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+_cache = _ResponseCache(settings.IDEMPOTENCY_CACHE_SIZE)
+_key_locks: dict[tuple[str, str], asyncio.Lock] = {}
+_key_lock_users: dict[tuple[str, str], int] = {}
+
+
+def _reject_mismatch() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key was already used with a different request body",
+    )
+
+
+def _replay(stored: _StoredResponse, request_hash: str) -> Response:
+    if stored.request_hash != request_hash:
+        raise _reject_mismatch()
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _stored_from_record(record) -> _StoredResponse:
+    # Keep it in the front cache no longer than it lives in the table
+    ttl = (record.expires_at - datetime.utcnow()).total_seconds()
+    return _StoredResponse(
+        record.request_hash, record.status_code, record.response_body, time.monotonic() + ttl
+    )
+
+
+def _records_engine() -> Engine:
+    """
+    A small engine for idempotency records, separate from the request pool.
+
+    The response is stored while the request's own Session still holds its
+    pooled connection (yield dependencies close after the response is sent),
+    so taking a second one from the same pool could let a burst of keyed
+    requests pin the whole pool, each waiting for its second connection.
+    """
+    return create_db_engine(pool_size=settings.IDEMPOTENCY_DB_POOL_SIZE, max_overflow=0)
+
+
+_RecordSession = sessionmaker(bind=_records_engine(), autocommit=False, autoflush=False, future=True)
+
+
+def _db_call(fn: Callable, *args):
+    db = _RecordSession()
+    try:
+        return fn(db, *args)
+    finally:
+        db.close()
+
+
+class IdempotentRoute(APIRoute):
+    """APIRoute that stores and replays responses of `@idempotent` endpoints."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if not getattr(self.endpoint, "__idempotent__", False):
+            return handler
+        route = f"{','.join(sorted(self.methods))} {self.path_format}"
+
+        async def idempotent_handler(request: Request) -> Response:
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None:
+                return await handler(request)
+            if not key or len(key) > 255:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Idempotency-Key must be 1-255 characters",
+                )
+
+            request_hash = hashlib.sha256(await request.body()).hexdigest()
+            cache_key = (route, key)
+            stored = _cache.get(cache_key)
+            if stored is not None:
+                return _replay(stored, request_hash)
+
+            # Duplicates within this worker queue here behind the first request
+            lock = _key_locks.setdefault(cache_key, asyncio.Lock())
+            _key_lock_users[cache_key] = _key_lock_users.get(cache_key, 0) + 1
+            try:
+                async with lock:
+                    return await self._handle_key(handler, request, route, key, request_hash)
+            finally:
+                _key_lock_users[cache_key] -= 1
+                if not _key_lock_users[cache_key]:
+                    del _key_lock_users[cache_key]
+                    del _key_locks[cache_key]
+
+        return idempotent_handler
+
+    async def _handle_key(
+        self,
+        handler: Callable,
+        request: Request,
+        route: str,
+        key: str,
+        request_hash: str,
+    ) -> Response:
+        cache_key = (route, key)
+        stored = _cache.get(cache_key)
+        if stored is not None:
+            return _replay(stored, request_hash)
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        # Read first so replays never write; only an unknown key is claimed
+        record = await run_in_threadpool(_db_call, get_idempotency_record, route, key)
+        claimed = False
+        while not claimed:
+            if record is None:
+                claimed, record = await run_in_threadpool(
+                    _db_call, claim_idempotency_key, route, key, request_hash
+                )
+                continue
+            if record.request_hash != request_hash:
+                raise _reject_mismatch()
+            if record.status_code is not None:
+                stored = _stored_from_record(record)
+                _cache.put(cache_key, stored)
+                return _replay(stored, request_hash)
+            # Another worker is processing this key; wait for its outcome
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still being processed",
+                )
+            await asyncio.sleep(0.05)
+            record = await run_in_threadpool(_db_call, get_idempotency_record, route, key)
+
+        return await self._run_and_store(handler, request, route, key, request_hash)
+
+    async def _run_and_store(
+        self,
+        handler: Callable,
+        request: Request,
+        route: str,
+        key: str,
+        request_hash: str,
+    ) -> Response:
+        try:
+            response = await handler(request)
+        except HTTPException as exc:
+            if exc.status_code >= 500:
+                await run_in_threadpool(_db_call, release_idempotency_key, route, key)
+            else:
+                body = json.dumps({"detail": exc.detail}).encode("utf-8")
+                await self._store(route, key, request_hash, exc.status_code, body)
+            raise
+        except BaseException:
+            await run_in_threadpool(_db_call, release_idempotency_key, route, key)
+            raise
+
+        if response.status_code >= 500:
+            await run_in_threadpool(_db_call, release_idempotency_key, route, key)
+        else:
+            await self._store(route, key, request_hash, response.status_code, response.body)
+        return response
+
+    async def _store(self, route: str, key: str, request_hash: str, status_code: int, body: bytes) -> None:
+        # The endpoint already ran (and committed); failing to record its
+        # outcome must not turn its response into a 500
+        try:
+            await run_in_threadpool(_db_call, complete_idempotency_key, route, key, status_code, body)
+        except Exception:
+            logger.exception("Storing idempotent response failed", extra={"route": route})
+            try:
+                # Don't leave the key "in progress" until IDEMPOTENCY_LOCK_TIMEOUT
+                await run_in_threadpool(_db_call, release_idempotency_key, route, key)
+            except Exception:
+                logger.exception("Releasing idempotency key failed", extra={"route": route})
+            return
+        _cache.put(
+            (route, key),
+            _StoredResponse(
+                request_hash, status_code, body, time.monotonic() + settings.IDEMPOTENCY_TTL_SECONDS
+            ),
+        )
+
+
+async def purge_expired_keys_periodically() -> None:
+    """Background task deleting expired idempotency records every IDEMPOTENCY_PURGE_INTERVAL."""
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL)
+        try:
+            deleted = await run_in_threadpool(_db_call, purge_expired_idempotency_keys)
+            logger.info("Purged expired idempotency keys", extra={"deleted": deleted})
+        except Exception:
+            logger.exception("Purging expired idempotency keys failed")
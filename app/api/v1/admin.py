@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from app.api.deps import get_current_admin
+from app.core import profiler, timing
+from app.core.config import settings
+from app.core.logging import dropped_records
+from app.middleware.load_shedding import limiter
+from app.schemas.admin import ServerTimingState
+from app.services.availability_service import availability_index
+from app.services.login_event_service import login_event_writer
+from app.services.user_service import user_lookups
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/server-timing", response_model=ServerTimingState)
+def get_server_timing():
+    """Whether this worker emits Server-Timing headers and timing records."""
+    return {"enabled": timing.is_enabled()}
+
+
+@router.put("/server-timing", response_model=ServerTimingState)
+def set_server_timing(state: ServerTimingState):
+    """
+    Switch Server-Timing on or off without a redeploy.
+
+    The switch applies to the worker that handles this request; repeat it per
+    worker or set SERVER_TIMING_ENABLED for a fleet-wide default.
+    """
+    timing.set_enabled(state.enabled)
+    return {"enabled": timing.is_enabled()}
+
+
+@router.get("/metrics", response_model=dict)
+def get_metrics():
+    """In-process counters for this worker."""
+    return {
+        "singleflight": user_lookups.stats(),
+        "log_records_dropped": dropped_records(),
+        "load_shedding": limiter.stats(),
+        "login_events": login_event_writer.stats(),
+        "availability_filter": availability_index.stats(),
+    }
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(5.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+    all_frames: bool = False,
+):
+    """
+    Sample the stacks of every thread in this worker for `seconds`.
+
+    Returns collapsed stacks, ready for flamegraph.pl or speedscope. By default
+    only stacks touching app, SQLAlchemy, bcrypt or jose code are kept; set
+    `all_frames` to include idle threads as well.
+    """
+    try:
+        return await profiler.sample_stacks(
+            seconds,
+            interval_ms / 1000,
+            modules=None if all_frames else profiler.DEFAULT_MODULES,
+        )
+    except profiler.ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+
+
+@router.get("/profile/allocations", response_model=dict)
+async def profile_allocations(
+    request: Request,
+    seconds: float = Query(5.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    top: int = Query(25, ge=1, le=200),
+):
+    """Trace allocations in this worker for `seconds`, grouped by route."""
+    code_ranges = {}
+    for route in request.app.routes:
+        if isinstance(route, APIRoute):
+            code = route.endpoint.__code__
+            last_line = max((line for _, _, line in code.co_lines() if line is not None), default=code.co_firstlineno)
+            label = f"{','.join(sorted(route.methods))} {route.path}"
+            code_ranges[label] = (code.co_filename, code.co_firstlineno, last_line)
+    try:
+        return await profiler.trace_allocations(seconds, code_ranges, top)
+    except profiler.ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
@@ -1,11 +1,12 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
+from app.api.idempotency import IdempotentRoute, idempotent
 from app.core.config import settings
 from app.core.security import create_access_token
-from app.schemas.auth import Token, UserLogin, UserRegister, ForgotPassword, ResetPassword
+from app.schemas.auth import Token, UserLogin, UserRegister, ForgotPassword, ResetPassword, Availability
 from app.services.user_service import (
     authenticate_user,
     create_user_with_password,
@@ -14,16 +15,23 @@ from app.services.user_service import (
     create_password_reset_token_for_user,
     reset_user_password,
 )
+from app.services.availability_service import is_email_available, is_username_available
 from app.services.email_service import send_password_reset_email
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=IdempotentRoute)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
+@idempotent
 def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    """Register a new user."""
+    """
+    Register a new user.
+
+    Send an `Idempotency-Key` header to make retries safe: a repeated request
+    with the same key gets the original response back.
+    """
     # Check if user already exists
     existing_user = get_user_by_email(db, user_data.email)
     if existing_user:
@@ -54,14 +62,39 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     }
 
 
+@router.get("/availability", response_model=Availability)
+def availability(
+    email: str | None = Query(None, max_length=255),
+    username: str | None = Query(None, max_length=255),
+    db: Session = Depends(get_db)
+):
+    """
+    Check whether an email and/or username is still free.
+
+    Most free values are answered from an in-memory filter without a database
+    query. The answer is advisory: /register still enforces uniqueness.
+    """
+    if email is None and username is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide email and/or username"
+        )
+    return {
+        "email": is_email_available(db, email) if email is not None else None,
+        "username": is_username_available(db, username) if username is not None else None,
+    }
+
+
 @router.post("/login", response_model=Token)
 def login(
     login_data: UserLogin,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Login and get access token."""
     identifier = login_data.email or login_data.username
-    user = authenticate_user(db, identifier, login_data.password)
+    ip_address = request.client.host if request.client else None
+    user = authenticate_user(db, identifier, login_data.password, ip_address=ip_address)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -113,6 +146,7 @@ def forgot_password(
 
 
 @router.post("/reset-password", response_model=dict, status_code=status.HTTP_200_OK)
+@idempotent
 def reset_password(
     reset_password_data: ResetPassword,
     db: Session = Depends(get_db)
@@ -121,6 +155,7 @@ def reset_password(
     Reset password using a reset token.
     
     The token should be obtained from the forgot-password endpoint via email.
+    Supports the `Idempotency-Key` header like /register.
     """
     user, error_message = reset_user_password(db, reset_password_data.token, reset_password_data.new_password)
     
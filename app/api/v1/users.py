@@ -1,9 +1,10 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from app.schemas.user import UserRead
+from app.schemas.user import UserRead, UserSearchPage
 from app.api.deps import get_db, get_current_user
-from app.services.user_service import get_user
+from app.core.config import settings
+from app.services.user_service import get_user, search_users
 from app.models.user import User
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -15,6 +16,27 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+@router.get("/search", response_model=UserSearchPage)
+def api_search_users(
+    q: str = Query(..., min_length=3, max_length=255),
+    limit: int = Query(settings.USER_SEARCH_DEFAULT_LIMIT, ge=1, le=settings.USER_SEARCH_MAX_LIMIT),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search users by partial email, username or full name (requires authentication).
+
+    Queries shorter than 3 characters are rejected because trigram indexes
+    cannot serve them. Pass `next_cursor` from a page as `cursor` to get the next one.
+    """
+    try:
+        users, next_cursor = search_users(db, q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": users, "next_cursor": next_cursor}
+
+
 @router.get("/{user_id}", response_model=UserRead)
 def api_get_user(
     user_id: uuid.UUID,
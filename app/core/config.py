@@ -1,15 +1,86 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
 
+class RouteBudget(BaseModel):
+    """Concurrency budget for requests whose path starts with `prefix`."""
+    prefix: str
+    max_in_flight: int
+    max_queued: int
+    queue_timeout: float
+    # Lower values get freed capacity first
+    priority: int = 0
+
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "My FastAPI App"
     ENV: str = "development"
     DATABASE_URL: str
     DEBUG: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # SELECT 1 on every checkout; can be turned off when /readyz gates traffic
+    DB_POOL_PRE_PING: bool = True
+    # Replace pooled connections before server/proxy idle timeouts drop them
+    DB_POOL_RECYCLE: int = 1800
+    # Connections each worker opens at startup, before taking traffic
+    DB_POOL_WARMUP: int = 5
+    READINESS_CHECK_INTERVAL: float = 5.0
+    # Also the connect timeout for PostgreSQL connections
+    READINESS_CHECK_TIMEOUT: float = 3.0
+    # Create tables from the models at startup (init_db); meant for SQLite
+    # benchmark/test runs such as DATABASE_URL=sqlite:// where nothing else could
+    DB_BOOTSTRAP_SCHEMA: bool = False
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    USER_SEARCH_DEFAULT_LIMIT: int = 20
+    USER_SEARCH_MAX_LIMIT: int = 100
+    # Closest matches per column scored and ranked per search page; bounds the cost of broad terms
+    USER_SEARCH_MAX_CANDIDATES: int = 1000
+    # Let PostgreSQL generate user ids with uuid_generate_v7() instead of the app
+    USER_ID_SERVER_DEFAULT: bool = False
+    # Set once the users_partitioning migrations are applied: email/username
+    # lookups then resolve the id via user_lookup and read a single partition
+    USERS_PARTITIONED: bool = False
+    # Collapse concurrent identical user lookups in a worker into one query
+    SINGLEFLIGHT_ENABLED: bool = True
+    LOG_LEVEL: str = "INFO"
+    # Records beyond this many waiting to be written are dropped, never blocked on
+    LOG_QUEUE_SIZE: int = 10000
+    # Initial state; can be switched per worker at runtime via /admin/server-timing
+    SERVER_TIMING_ENABLED: bool = True
+    SERVER_TIMING_LOG_SAMPLE_RATE: float = 1.0
+    ADMIN_EMAILS: list[str] = []
+    LOAD_SHED_ENABLED: bool = True
+    # Requests admitted at once across all groups; match the AnyIO threadpool size (40)
+    LOAD_SHED_MAX_IN_FLIGHT: int = 40
+    LOAD_SHED_RETRY_AFTER: int = 1
+    LOAD_SHED_BUDGETS: dict[str, RouteBudget] = {
+        "users": RouteBudget(prefix="/api/v1/users", max_in_flight=40, max_queued=80, queue_timeout=0.5, priority=0),
+        "availability": RouteBudget(prefix="/api/v1/auth/availability", max_in_flight=40, max_queued=80, queue_timeout=0.5, priority=0),
+        "auth": RouteBudget(prefix="/api/v1/auth", max_in_flight=16, max_queued=32, queue_timeout=1.0, priority=1),
+    }
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    # Per-worker LRU of recent idempotent responses; 0 disables it
+    IDEMPOTENCY_CACHE_SIZE: int = 1024
+    # How long a duplicate waits for the first request before getting 409
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    # An in-progress key older than this is considered abandoned and taken over
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 60
+    IDEMPOTENCY_PURGE_INTERVAL: int = 3600
+    # Connections for idempotency records, kept apart from the request pool
+    IDEMPOTENCY_DB_POOL_SIZE: int = 2
+    # Login events waiting to be written; more are dropped (and counted)
+    LOGIN_EVENTS_BUFFER_SIZE: int = 10000
+    LOGIN_EVENTS_BATCH_SIZE: int = 500
+    LOGIN_EVENTS_FLUSH_INTERVAL: float = 1.0
+    AVAILABILITY_FILTER_MIN_CAPACITY: int = 100000
+    AVAILABILITY_FILTER_ERROR_RATE: float = 0.01
+    AVAILABILITY_FILTER_REBUILD_INTERVAL: int = 600
+    # Upper bound for one /admin/profile run
+    PROFILER_MAX_SECONDS: float = 30.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,123 @@
+"""Non-blocking structured logging.
+
+Records from the `app` logger tree are put on a bounded in-memory queue by a
+QueueHandler and written as JSON lines by a QueueListener thread, so a slow or
+blocked log sink never stalls request handling. When the queue is full, records
+are dropped and counted instead of blocking.
+
+Usage:
+    logger = logging.getLogger(__name__)
+    logger.info("password reset requested", extra={"email": email})
+
+    # High-volume events: keep roughly 1 in 100
+    logger.info("request timing", extra={"sample_rate": 0.01, "phases": phases})
+"""
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from app.core.config import settings
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+_handler: "NonBlockingQueueHandler | None" = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key != "sample_rate":
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a record with probability `sample_rate` (from `extra`), default 1."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        return rate is None or rate >= 1 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that tags records with the request ID and drops them when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.addFilter(SamplingFilter())
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve everything that depends on the calling thread/context now;
+        # the listener thread formats the record later
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(stream: IO[str] | None = None) -> None:
+    """Attach the queue handler to the `app` logger and start the listener thread."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    sink = logging.StreamHandler(stream or sys.stdout)
+    sink.setFormatter(JsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, sink, respect_handler_level=True)
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL)
+    app_logger.addHandler(_handler)
+    app_logger.propagate = False
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _handler
+    if _listener is None:
+        return
+    _listener.stop()
+    app_logger = logging.getLogger("app")
+    app_logger.removeHandler(_handler)
+    app_logger.propagate = True
+    _listener = None
+    _handler = None
+
+
+def dropped_records() -> int:
+    """Number of records dropped because the log queue was full."""
+    return _handler.dropped if _handler is not None else 0
@@ -0,0 +1,169 @@
+"""On-demand statistical profiling of the current worker.
+
+Nothing runs until a profile is requested: `sample_stacks` starts a sampler
+thread that reads every thread's Python stack via `sys._current_frames()` at a
+fixed interval and counts identical stacks, and `trace_allocations` turns on
+`tracemalloc` only for the requested window. Only one profile may run per
+worker at a time.
+
+Stacks are returned in collapsed format (`frame;frame;frame count` per line),
+which flamegraph.pl, speedscope and inferno read directly. Frames are labelled
+`module:function`; time spent inside C extensions such as bcrypt is attributed
+to the Python function that called them.
+"""
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Iterable
+
+DEFAULT_MODULES = ("app.", "sqlalchemy", "bcrypt", "jose")
+
+_busy = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def _collect(
+    seconds: float,
+    interval: float,
+    modules: tuple[str, ...],
+    counts: Counter,
+) -> None:
+    sampler = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == sampler:
+                continue
+            labels = []
+            relevant = not modules
+            while frame is not None:
+                label = _frame_label(frame)
+                if not relevant and label.startswith(modules):
+                    relevant = True
+                labels.append(label)
+                frame = frame.f_back
+            if relevant:
+                labels.append(names.get(ident, str(ident)))
+                counts[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+
+
+async def sample_stacks(
+    seconds: float,
+    interval: float = 0.01,
+    modules: Iterable[str] | None = DEFAULT_MODULES,
+) -> str:
+    """
+    Sample all threads for `seconds` and return collapsed stacks.
+
+    Only stacks containing a frame from one of `modules` (module name
+    prefixes) are kept, which drops idle threadpool and event loop threads;
+    pass None to keep everything.
+
+    Raises:
+        ProfilerBusy: If another profile is already running in this worker
+    """
+    if not _busy.acquire(blocking=False):
+        raise ProfilerBusy()
+    counts: Counter = Counter()
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def finish() -> None:
+        if not done.done():
+            done.set_result(None)
+
+    def run() -> None:
+        # The thread owns the lock, so a cancelled request cannot let a second
+        # profile start while this one is still sampling
+        try:
+            _collect(seconds, interval, tuple(modules or ()), counts)
+        finally:
+            _busy.release()
+            loop.call_soon_threadsafe(finish)
+
+    # A dedicated thread, so a saturated threadpool cannot delay or skew sampling
+    try:
+        threading.Thread(target=run, name="app-profiler", daemon=True).start()
+    except BaseException:
+        _busy.release()
+        raise
+    await done
+    return "\n".join(f"{stack} {count}" for stack, count in counts.most_common())
+
+
+async def trace_allocations(
+    seconds: float,
+    code_ranges: dict[str, tuple[str, int, int]],
+    top: int = 25,
+) -> dict:
+    """
+    Trace memory allocations for `seconds` and attribute them to routes.
+
+    Reports allocations made during the window that are still alive at its
+    end, i.e. what the traffic in that window retained.
+
+    `code_ranges` maps a route label to its endpoint's (filename, first line,
+    last line); an allocation is charged to the first route whose endpoint
+    appears in its traceback, otherwise to "other".
+
+    Raises:
+        ProfilerBusy: If another profile is already running, or tracemalloc
+            is already enabled by someone else
+    """
+    if not _busy.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        if tracemalloc.is_tracing():
+            raise ProfilerBusy()
+        tracemalloc.start(25)
+        try:
+            await asyncio.sleep(seconds)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+    finally:
+        _busy.release()
+
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    per_route: dict[str, list[int]] = {}
+    for stat in snapshot.statistics("traceback"):
+        route = "other"
+        for frame in stat.traceback:
+            for label, (filename, first, last) in code_ranges.items():
+                if frame.filename == filename and first <= frame.lineno <= last:
+                    route = label
+                    break
+            if route != "other":
+                break
+        totals = per_route.setdefault(route, [0, 0])
+        totals[0] += stat.size
+        totals[1] += stat.count
+
+    return {
+        "seconds": seconds,
+        "routes": [
+            {"route": route, "bytes": size, "count": count}
+            for route, (size, count) in sorted(per_route.items(), key=lambda item: -item[1][0])
+        ],
+        "top": [
+            {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             "bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+    }
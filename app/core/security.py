@@ -2,13 +2,18 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
+import logging
 import secrets
 from app.core.config import settings
+from app.core.timing import phase
+
+logger = logging.getLogger(__name__)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    with phase("bcrypt"):
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
 def get_password_hash(password: str) -> str:
@@ -17,7 +22,8 @@ def get_password_hash(password: str) -> str:
     password_bytes = password.encode('utf-8')
     # Generate salt and hash password
     salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    with phase("bcrypt"):
+        hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string
     return hashed.decode('utf-8')
 
@@ -30,14 +36,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    with phase("jwt"):
+        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT access token."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        with phase("jwt"):
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
@@ -68,15 +76,16 @@ def verify_password_reset_token(token: str) -> Optional[str]:
         # Check if this is a password reset token
         token_type = payload.get("type")
         if token_type != "password_reset":
-            # Debug: log what type we got (or None if missing)
-            print(f"[DEBUG] Token type mismatch. Expected 'password_reset', got: {token_type}")
-            print(f"[DEBUG] Token payload keys: {list(payload.keys())}")
+            logger.debug(
+                "Password reset token type mismatch",
+                extra={"token_type": token_type, "payload_keys": list(payload.keys())},
+            )
             return None
         email: str = payload.get("sub")
         if email is None:
             return None
         return email
     except JWTError as e:
-        print(f"[DEBUG] JWT decode error: {e}")
+        logger.debug("Password reset token rejected", extra={"error": str(e)})
         return None
 
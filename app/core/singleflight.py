@@ -0,0 +1,118 @@
+"""Single-flight de-duplication of concurrent identical calls.
+
+When many requests in a worker ask for the same thing at the same moment
+(e.g. a popular profile right after a cache expiry), only the first caller
+for a key runs the function; the others wait for it and receive the same
+result or exception. Nothing is cached: once the call finishes, the next
+caller for that key runs it again.
+"""
+import asyncio
+import threading
+from functools import partial
+from typing import Any, Callable, Hashable
+
+import anyio.to_thread
+
+from app.core.config import settings
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one execution.
+
+    `do` serves threadpool (sync) callers. `do_async` serves coroutines: awaiters
+    on the event loop share one task, and that task runs the function through
+    `do` in a worker thread, so async and sync callers for the same key also
+    share a single execution.
+
+    Shared results are handed to every caller as-is, so they should be
+    immutable (rows, tuples, primitives) rather than session-bound ORM objects.
+    The shared function must not use resources owned by one caller (such as
+    its Session): with `do_async` it keeps running after that caller is
+    cancelled, in a thread of its own.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Call fn(*args), or wait for an in-flight call with the same key."""
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return fn(*args)
+
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Async variant of `do` for a blocking fn, which runs in a worker thread."""
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await anyio.to_thread.run_sync(partial(fn, *args))
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(anyio.to_thread.run_sync(partial(self.do, key, fn, *args)))
+            self._tasks[key] = task
+            task.add_done_callback(partial(self._forget_task, key))
+        else:
+            with self._lock:
+                self.calls += 1
+                self.collapsed += 1
+        # shield: one cancelled awaiter must not cancel the query for the others
+        return await asyncio.shield(task)
+
+    def _forget_task(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every awaiter was cancelled
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters since startup; `collapsed` calls were served by another caller's query."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls),
+            }
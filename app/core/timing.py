@@ -0,0 +1,57 @@
+"""Per-request phase timers reported through the Server-Timing header.
+
+ServerTimingMiddleware starts a fresh phase table for each request; code on the
+hot path wraps its expensive steps:
+
+    with phase("bcrypt"):
+        bcrypt.checkpw(...)
+
+Durations for the same phase name add up (three queries give one "db" total).
+The table lives in a context variable, which FastAPI copies into threadpool
+calls, so sync endpoints and dependencies record into the same request.
+When timing is disabled, or outside a request, `phase` does nothing but one
+context-variable lookup.
+"""
+import time
+from contextvars import ContextVar
+
+from app.core.config import settings
+
+_phases: ContextVar[dict[str, float] | None] = ContextVar("server_timing_phases", default=None)
+_enabled = settings.SERVER_TIMING_ENABLED
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """Switch timing on or off for this worker without a restart."""
+    global _enabled
+    _enabled = enabled
+
+
+def start_request() -> dict[str, float]:
+    """Begin collecting phases for the current request and return the table."""
+    phases: dict[str, float] = {}
+    _phases.set(phases)
+    return phases
+
+
+class phase:
+    """Context manager adding the elapsed wall time of its block to a named phase."""
+
+    __slots__ = ("name", "phases", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.phases = _phases.get()
+        if self.phases is not None:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        if self.phases is not None:
+            elapsed = time.perf_counter() - self.start
+            self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
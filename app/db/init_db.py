@@ -1,9 +1,22 @@
+from sqlalchemy.engine import Engine
+
 from app.db.session import engine
 from app.db.base import Base
 
 # import all models here so they are registered with Base
-from app.models import user  # noqa: F401
+from app.models import user, idempotency, login_event  # noqa: F401
+
+
+def init_db(bind: Engine = engine):
+    """
+    Create all tables straight from the models.
+
+    A one-shot bootstrap for SQLite benchmark and test databases (and
+    throwaway PostgreSQL ones); real PostgreSQL deployments use the Alembic
+    migrations. Existing tables are left alone.
+    """
+    Base.metadata.create_all(bind=bind)
 
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+if __name__ == "__main__":
+    init_db()
@@ -0,0 +1,219 @@
+"""Helpers for production-safe Alembic migrations on large tables.
+
+Plain Alembic operations run inside the migration transaction, so a single
+UPDATE over the whole table or a non-concurrent CREATE INDEX holds locks on
+`users` until the migration finishes. These helpers split that work into short
+transactions instead:
+
+- `batched_backfill` updates rows in small committed primary-key ranges with a pause between them
+- `create_index_concurrently` / `drop_index_concurrently` build and drop indexes
+  without blocking writes
+- `add_constraint_not_valid` / `validate_constraint` add a constraint for new rows
+  first and check existing rows later under a weaker lock
+- `set_not_null` makes a column NOT NULL without a full-table scan under an exclusive lock
+
+All helpers are PostgreSQL-specific and must be called from a migration's
+upgrade()/downgrade().
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+from alembic import op
+from sqlalchemy import text
+
+logger = logging.getLogger("alembic.online_migrations")
+
+
+def _quote(name: str) -> str:
+    return op.get_bind().dialect.identifier_preparer.quote(name)
+
+
+@contextmanager
+def lock_timeout(timeout: str = "5s") -> Iterator[None]:
+    """
+    Fail fast instead of queueing behind long transactions while taking locks.
+
+    A DDL statement waiting for its lock blocks every query queued behind it,
+    so a short lock_timeout turns a potential outage into a retryable error.
+
+    SET LOCAL lasts until the migration transaction ends. A RESET afterwards
+    would fail in the transaction aborted by the timeout and hide its error.
+    """
+    op.execute(f"SET LOCAL lock_timeout = '{timeout}'")
+    yield
+
+
+def batched_backfill(
+    table: str,
+    set_clause: str,
+    where: str,
+    batch_size: int = 10_000,
+    pause: float = 0.1,
+    max_batches: int | None = None,
+    key_column: str = "id",
+) -> int:
+    """
+    Run `UPDATE table SET set_clause WHERE where` in committed chunks.
+
+    The table is walked in ranges of `batch_size` consecutive `key_column`
+    values (an indexed, unique column that the backfill does not change), so
+    each batch is an index range scan that starts where the previous one
+    stopped instead of rescanning rows that are already done. Each chunk
+    commits on its own so row locks are held only for the duration of one
+    batch, and `pause` gives replication and autovacuum room to keep up.
+
+    Rows inserted after the walk has passed their key are not visited, so new
+    rows must already get the value from the application or a column default.
+
+    Args:
+        table: Table to update
+        set_clause: SQL for the SET clause, e.g. "id_new = uuid_generate_v4()"
+        where: SQL predicate selecting rows that still need the backfill
+        batch_size: Keys covered per transaction
+        pause: Seconds to sleep between batches
+        max_batches: Optional safety limit on the number of batches
+        key_column: Unique, indexed column to page through
+
+    Returns:
+        int: Total number of rows updated
+    """
+    if op.get_context().as_sql:
+        raise RuntimeError("batched_backfill needs a live connection; it cannot run in --sql mode")
+
+    quoted = _quote(table)
+    key = _quote(key_column)
+    estimate = op.get_bind().execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"),
+        {"t": table},
+    ).scalar() or 0
+
+    def upper_bound(last):
+        # The key batch_size rows ahead; None when fewer rows are left
+        after = "" if last is None else f"WHERE {key} > :last "
+        return op.get_bind().execute(
+            text(f"SELECT {key} FROM {quoted} {after}ORDER BY {key} LIMIT 1 OFFSET :offset"),
+            {"last": last, "offset": batch_size - 1},
+        ).scalar()
+
+    def update(last, upper) -> int:
+        bounds = []
+        if last is not None:
+            bounds.append(f"{key} > :last")
+        if upper is not None:
+            bounds.append(f"{key} <= :upper")
+        bounds.append(f"({where})")
+        return op.get_bind().execute(
+            text(f"UPDATE {quoted} SET {set_clause} WHERE {' AND '.join(bounds)}"),
+            {"last": last, "upper": upper},
+        ).rowcount
+
+    total = 0
+    batches = 0
+    last = None
+    started = time.monotonic()
+    with op.get_context().autocommit_block():
+        while max_batches is None or batches < max_batches:
+            upper = upper_bound(last)
+            total += update(last, upper)
+            batches += 1
+            scanned = batches * batch_size
+            elapsed = time.monotonic() - started
+            rate = scanned / elapsed if elapsed else 0.0
+            progress = f"~{min(scanned, estimate)}/~{estimate}" if estimate > 0 else f"~{scanned}"
+            logger.info(
+                "backfill %s: %s rows scanned, %d updated, %s up to %s (%.0f rows/s)",
+                table, progress, total, key_column, upper if upper is not None else "end", rate,
+            )
+            if upper is None:
+                break
+            last = upper
+            if pause:
+                time.sleep(pause)
+    logger.info("backfill %s done: %d rows in %d batches", table, total, batches)
+    return total
+
+
+def create_index_concurrently(
+    index_name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    **kw,
+) -> None:
+    """
+    Build an index without blocking writes.
+
+    A failed concurrent build leaves an INVALID index behind, which
+    IF NOT EXISTS would silently keep, so any invalid leftover is dropped first.
+    """
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            invalid = op.get_bind().execute(
+                text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ),
+                {"name": index_name},
+            ).first()
+            if invalid:
+                logger.warning("dropping invalid index %s left by a failed build", index_name)
+                op.drop_index(index_name, table_name=table, postgresql_concurrently=True)
+        op.create_index(
+            index_name,
+            table,
+            list(columns),
+            unique=unique,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table: str) -> None:
+    """Drop an index without blocking reads or writes on the table."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def add_constraint_not_valid(table: str, name: str, definition: str) -> None:
+    """
+    Add a CHECK or FOREIGN KEY constraint that is enforced for new rows only.
+
+    NOT VALID skips the scan of existing rows, so the ACCESS EXCLUSIVE lock is
+    held only momentarily. Follow up with `validate_constraint`.
+    """
+    with lock_timeout():
+        op.execute(f"ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition} NOT VALID")
+
+
+def validate_constraint(table: str, name: str) -> None:
+    """
+    Check existing rows against a NOT VALID constraint.
+
+    VALIDATE only takes a SHARE UPDATE EXCLUSIVE lock, so reads and writes keep
+    flowing; it runs in its own transaction so that lock is released right away.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {_quote(table)} VALIDATE CONSTRAINT {_quote(name)}")
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    Make a column NOT NULL without scanning the table under an exclusive lock.
+
+    PostgreSQL 12+ skips the scan for SET NOT NULL when a validated
+    `CHECK (column IS NOT NULL)` constraint already proves it.
+    """
+    check_name = f"{table}_{column}_not_null"
+    add_constraint_not_valid(table, check_name, f"CHECK ({_quote(column)} IS NOT NULL)")
+    validate_constraint(table, check_name)
+    with lock_timeout():
+        op.alter_column(table, column, nullable=False)
+        op.drop_constraint(check_name, table, type_="check")
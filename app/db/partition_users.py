@@ -0,0 +1,105 @@
+"""Copy existing users into the hash-partitioned `users_partitioned` table.
+
+Step 2 of the users_partitioning migrations (see README, "Partitioning
+users"). Once revision d5c3b19259f2 is applied, new writes to `users` are
+mirrored into `users_partitioned` by a trigger; this tool copies the rows that
+existed before, in short keyset-paginated transactions, so it can run against
+a live database and be resumed with --after.
+
+When the copy is complete and the row counts match, the table is marked as
+backfilled, which the swap migration checks before it takes over.
+
+Usage:
+    python -m app.db.partition_users --batch-size 10000 --pause 0.05
+"""
+import argparse
+import logging
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+logger = logging.getLogger("app.db.partition_users")
+
+# Stored as the table comment; the swap migration refuses to run without it
+BACKFILL_COMPLETE = "users backfill complete"
+
+# FOR SHARE makes concurrent updates/deletes of the batch wait for this
+# transaction, and skips rows deleted since the snapshot, so the copy can never
+# resurrect a deleted user or overwrite a newer version mirrored by the trigger
+_COPY_BATCH = text("""
+    WITH batch AS (
+        SELECT * FROM users WHERE id > :after ORDER BY id LIMIT :batch_size FOR SHARE
+    ), copied AS (
+        INSERT INTO users_partitioned SELECT * FROM batch
+        ON CONFLICT (id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT id FROM batch ORDER BY id DESC LIMIT 1) AS last_id,
+        (SELECT count(*) FROM batch) AS scanned,
+        (SELECT count(*) FROM copied) AS copied
+""")
+
+
+def copy_users(after: uuid.UUID, batch_size: int, pause: float) -> int:
+    """Copy users with id > `after` in committed batches; returns rows copied."""
+    with engine.connect() as conn:
+        estimate = conn.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        ).scalar() or 0
+
+    total = 0
+    scanned = 0
+    started = time.monotonic()
+    while True:
+        with engine.begin() as conn:
+            row = conn.execute(_COPY_BATCH, {"after": after, "batch_size": batch_size}).one()
+        if row.last_id is None:
+            break
+        after = row.last_id
+        total += row.copied
+        scanned += row.scanned
+        elapsed = time.monotonic() - started
+        logger.info(
+            "copied %d rows, scanned %d/~%d (%.0f rows/s), resume with --after %s",
+            total, scanned, estimate, scanned / elapsed if elapsed else 0.0, after,
+        )
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def verify_and_mark() -> bool:
+    """Compare row counts in one snapshot and mark the copy complete if they match."""
+    with engine.begin() as conn:
+        source, target = conn.execute(
+            text("SELECT (SELECT count(*) FROM users), (SELECT count(*) FROM users_partitioned)")
+        ).one()
+        if source != target:
+            logger.error("row counts differ: users=%d users_partitioned=%d", source, target)
+            return False
+        conn.execute(text("ANALYZE users_partitioned"))
+        conn.execute(text(f"COMMENT ON TABLE users_partitioned IS '{BACKFILL_COMPLETE}'"))
+    logger.info("verified %d rows; users_partitioned is ready for the swap migration", target)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    parser.add_argument("--after", type=uuid.UUID, default=uuid.UUID(int=0),
+                        help="resume after this id (printed with every batch)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    copy_users(args.after, args.batch_size, args.pause)
+    if not verify_and_mark():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,73 @@
-from sqlalchemy import create_engine
+import atexit
+import math
+import os
+import tempfile
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db import sqlite
+
+
+_scratch_db_path: str | None = None
+
+
+def _scratch_db() -> str:
+    """Path of this process's throwaway SQLite file, removed again at exit."""
+    global _scratch_db_path
+    if _scratch_db_path is None:
+        fd, _scratch_db_path = tempfile.mkstemp(prefix="app-", suffix=".db")
+        os.close(fd)
+        atexit.register(_remove_scratch_db, _scratch_db_path)
+    return _scratch_db_path
+
+
+def _remove_scratch_db(path: str) -> None:
+    for name in (path, f"{path}-wal", f"{path}-shm"):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+def create_db_engine(url: str | None = None, **kwargs) -> Engine:
+    """
+    Create an engine for `url` (default: settings.DATABASE_URL).
+
+    PostgreSQL gets a regular connection pool configured by the DB_POOL_*
+    settings. SQLite URLs (`sqlite:///file.db`, or `sqlite://` for a scratch database)
+    are set up so the whole app runs on them for benchmarks and tests:
+    connections may be used from any threadpool thread, and get the pragmas
+    and PostgreSQL function stand-ins from app.db.sqlite.
+    `sqlite://` gets a throwaway file per process instead of memory: every
+    engine in the process then sees the same data, and concurrent requests
+    use separate connections. Neither a single shared in-memory connection
+    (threads would share one transaction) nor a shared-cache in-memory database
+    (table locks fail immediately instead of waiting) survives concurrent load.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    if url.get_backend_name() != "sqlite":
+        kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+        kwargs.setdefault("pool_recycle", settings.DB_POOL_RECYCLE)
+        if url.get_backend_name() == "postgresql":
+            # Bounds connection attempts to an unreachable server (libpq takes whole seconds)
+            kwargs.setdefault("connect_args", {}).setdefault(
+                "connect_timeout", max(1, math.ceil(settings.READINESS_CHECK_TIMEOUT))
+            )
+        return create_engine(url, future=True, **kwargs)
+
+    kwargs.setdefault("connect_args", {}).setdefault("check_same_thread", False)
+    if url.database in (None, "", ":memory:"):
+        url = url.set(database=_scratch_db())
+    engine = create_engine(url, future=True, **kwargs)
+    event.listen(engine, "connect", sqlite.on_connect)
+    return engine
+
 
 # Using synchronous engine (simple and stable for many apps)
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, future=True)
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
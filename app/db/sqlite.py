@@ -0,0 +1,56 @@
+"""SQLite stand-ins for the PostgreSQL features the app relies on.
+
+Lets the full stack run against SQLite (a file, or `sqlite://` for a throwaway one) for local
+benchmarks and tests: every new connection gets pragmas tuned for throughput
+and Python implementations of the SQL functions the queries use.
+
+- `similarity(a, b)`: pg_trgm's trigram similarity, used to rank user search
+- `greatest(...)`: PostgreSQL's GREATEST
+- `uuid_generate_v7()`: the users.id server default, used when USER_ID_SERVER_DEFAULT is on
+
+Search still scans the table here (no trigram indexes), so use PostgreSQL for
+anything that measures search at scale.
+"""
+import re
+
+from app.models.ids import uuid7
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _trigrams(value: str) -> set[str]:
+    # pg_trgm: lower-case, split into words, pad each with two spaces in front and one behind
+    grams = set()
+    for word in _NON_WORD.split(value.lower()):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: str | None, b: str | None) -> float | None:
+    if a is None or b is None:
+        return None
+    left, right = _trigrams(a), _trigrams(b)
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def greatest(*values):
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def on_connect(dbapi_connection, connection_record) -> None:
+    """`connect` event listener for SQLite engines (see app.db.session.create_db_engine)."""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed during writes; NORMAL syncs at checkpoints only
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+    dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+    dbapi_connection.create_function("greatest", -1, greatest, deterministic=True)
+    dbapi_connection.create_function("uuid_generate_v7", 0, lambda: uuid7().hex)
@@ -0,0 +1,23 @@
+import uuid
+
+from sqlalchemy.types import TypeDecorator, Uuid
+
+
+class GUID(TypeDecorator):
+    """
+    Dialect-portable UUID column.
+
+    Native `uuid` on PostgreSQL, CHAR(32) hex on SQLite and other backends;
+    always returns `uuid.UUID`. Unlike a bare Uuid column it also accepts ids
+    as strings, which the non-native storage would otherwise reject.
+    """
+    impl = Uuid
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(as_uuid=True)
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value
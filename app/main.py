@@ -1,7 +1,49 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from app.api.api_router import api_router
+from app.api.health import router as health_router
+from app.api.idempotency import purge_expired_keys_periodically
 from app.core.config import settings
+from app.core.logging import setup_logging, shutdown_logging
+from app.db.init_db import init_db
+from app.middleware.load_shedding import LoadSheddingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.services.availability_service import rebuild_periodically
+from app.services.health_service import check_readiness_periodically, warm_up
+from app.services.login_event_service import login_event_writer
 
-app = FastAPI(title=settings.PROJECT_NAME)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    if settings.DB_BOOTSTRAP_SCHEMA:
+        init_db()
+    # Before the first request, so it never pays for connection setup
+    await asyncio.to_thread(warm_up)
+    login_event_writer.start()
+    background_tasks = [
+        asyncio.create_task(check_readiness_periodically()),
+        asyncio.create_task(purge_expired_keys_periodically()),
+        asyncio.create_task(rebuild_periodically()),
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    # Flush buffered login events before the process exits
+    await asyncio.to_thread(login_event_writer.stop)
+    shutdown_logging()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(LoadSheddingMiddleware)
+app.add_middleware(RequestIDMiddleware)
+
+app.include_router(health_router)
 app.include_router(api_router, prefix="/api/v1")
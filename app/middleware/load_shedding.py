@@ -0,0 +1,151 @@
+"""Concurrency limiting and load shedding per route group."""
+import asyncio
+from collections import deque
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import RouteBudget, settings
+
+
+class _Group:
+    __slots__ = ("name", "budget", "in_flight", "waiters", "admitted", "shed", "timed_out")
+
+    def __init__(self, name: str, budget: RouteBudget):
+        self.name = name
+        self.budget = budget
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+
+class ConcurrencyLimiter:
+    """
+    Admission control for route groups sharing one worker.
+
+    Each group may run `max_in_flight` requests and queue `max_queued` more;
+    all groups together may run at most `max_in_flight` requests. A queued
+    request that is not admitted within its group's `queue_timeout` is
+    rejected, since its client will likely give up before it completes.
+    When a slot frees up, waiting groups are served in `priority` order so
+    cheap reads are not starved by expensive auth calls.
+
+    All state is touched from the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, budgets: dict[str, RouteBudget], max_in_flight: int):
+        self.groups = sorted(
+            (_Group(name, budget) for name, budget in budgets.items()),
+            key=lambda group: group.budget.priority,
+        )
+        # Matching is independent of priority: the most specific prefix wins
+        self._by_prefix = sorted(self.groups, key=lambda group: -len(group.budget.prefix))
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+
+    def match(self, path: str) -> _Group | None:
+        """The group with the longest prefix of `path`, if any."""
+        for group in self._by_prefix:
+            if path.startswith(group.budget.prefix):
+                return group
+        return None
+
+    def _has_capacity(self, group: _Group) -> bool:
+        return self.in_flight < self.max_in_flight and group.in_flight < group.budget.max_in_flight
+
+    def _admit(self, group: _Group) -> None:
+        self.in_flight += 1
+        group.in_flight += 1
+        group.admitted += 1
+
+    async def acquire(self, group: _Group) -> bool:
+        """Wait for a slot in `group`; False means the request should be shed."""
+        if not group.waiters and self._has_capacity(group):
+            self._admit(group)
+            return True
+        if len(group.waiters) >= group.budget.max_queued:
+            group.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        group.waiters.append(waiter)
+        try:
+            # shield: on timeout we need to know whether we were admitted meanwhile
+            await asyncio.wait_for(asyncio.shield(waiter), group.budget.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                return True
+            waiter.cancel()
+            group.waiters.remove(waiter)
+            group.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if waiter.done() and not waiter.cancelled():
+                self.release(group)
+            else:
+                waiter.cancel()
+                group.waiters.remove(waiter)
+            raise
+        return True
+
+    def release(self, group: _Group) -> None:
+        self.in_flight -= 1
+        group.in_flight -= 1
+        for candidate in self.groups:
+            while candidate.waiters and self._has_capacity(candidate):
+                waiter = candidate.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._admit(candidate)
+                waiter.set_result(None)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            group.name: {
+                "in_flight": group.in_flight,
+                "queued": len(group.waiters),
+                "admitted": group.admitted,
+                "shed": group.shed,
+                "timed_out": group.timed_out,
+            }
+            for group in self.groups
+        }
+
+
+limiter = ConcurrencyLimiter(settings.LOAD_SHED_BUDGETS, settings.LOAD_SHED_MAX_IN_FLIGHT)
+
+
+class LoadSheddingMiddleware:
+    """
+    Reject requests with 503 + Retry-After instead of queueing them without bound.
+
+    Requests outside every configured route group (docs, health checks) pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: ConcurrencyLimiter = limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        group = self.limiter.match(scope["path"]) if scope["type"] == "http" else None
+        if group is None or not settings.LOAD_SHED_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire(group):
+            response = JSONResponse(
+                {"detail": "Server is overloaded, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(group)
@@ -0,0 +1,66 @@
+"""Server-Timing header and per-request timing records."""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import timing
+from app.core.config import settings
+
+logger = logging.getLogger("app.timing")
+
+
+def _format_server_timing(phases: dict[str, float], total: float) -> str:
+    metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items()]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Report the phases recorded with `app.core.timing.phase` for each request.
+
+    Phases are emitted in the Server-Timing response header (visible in browser
+    devtools) and as an `app.timing` log record. Time not covered by a named
+    phase, such as request parsing and Pydantic validation, is the difference
+    between `total` and the sum of the phases.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not timing.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        phases = timing.start_request()
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = time.perf_counter() - start
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", _format_server_timing(phases, total)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - start
+            logger.info(
+                "request timing",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "total_ms": round(total * 1000, 3),
+                    "phases_ms": {name: round(s * 1000, 3) for name, s in phases.items()},
+                    "sample_rate": settings.SERVER_TIMING_LOG_SAMPLE_RATE,
+                },
+            )
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, SmallInteger, LargeBinary
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """Stored outcome of a request made with an Idempotency-Key header."""
+    __tablename__ = "idempotency_keys"
+
+    route = Column(String(length=255), primary_key=True)
+    key = Column(String(length=255), primary_key=True)
+    # SHA-256 of the request body, to reject a key reused for a different request
+    request_hash = Column(String(length=64), nullable=False)
+    # NULL while the first request is still being processed
+    status_code = Column(SmallInteger, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,71 @@
+"""Primary key generators for models."""
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The first 48 bits are the Unix timestamp in milliseconds, so new keys land
+    on the right-hand edge of a btree index instead of at random pages like
+    uuid4. The 12-bit rand_a field is used as a per-millisecond counter, which
+    keeps ids generated by one process strictly increasing even within the same
+    millisecond or when the clock steps backwards.
+
+    The result is a regular `uuid.UUID`, so it works with `UUID(as_uuid=True)`
+    columns and pydantic `uuid.UUID` fields unchanged.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Start low in the counter space so a burst has room to increment
+            _counter = int.from_bytes(os.urandom(2)) & 0x3FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                _last_ms += 1
+                _counter = 0
+        unix_ts_ms = _last_ms
+        counter = _counter
+
+    rand_b = int.from_bytes(os.urandom(8)) & 0x3FFF_FFFF_FFFF_FFFF
+    value = (
+        (unix_ts_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+# Same function as migration a6cfa8247285, for schemas created with
+# Base.metadata.create_all (init_db) instead of the migrations
+UUID_GENERATE_V7_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
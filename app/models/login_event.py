@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Index
+from app.db.base import Base
+from app.db.types import GUID
+
+
+class LoginEvent(Base):
+    """One login attempt, successful or not."""
+    __tablename__ = "login_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # NULL when the identifier did not match any user
+    user_id = Column(GUID(), nullable=True)
+    identifier = Column(String(length=255), nullable=False)
+    ip_address = Column(String(length=45), nullable=True)
+    # "success", "unknown_user" or "bad_password"
+    outcome = Column(String(length=32), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_login_events_user_id_created_at", "user_id", "created_at"),
+        # Rows arrive in time order, so a tiny BRIN index serves time-range scans
+        Index("ix_login_events_created_at", "created_at", postgresql_using="brin"),
+    )
@@ -1,17 +1,55 @@
-import uuid
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Column, String, DateTime, Index, column, event, table, text
+from app.core.config import settings
 from app.db.base import Base
+from app.db.types import GUID
+from app.models.ids import UUID_GENERATE_V7_SQL, uuid7
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    # Time-ordered ids keep inserts at the right edge of the primary key index.
+    # The database default always exists (migration a6cfa8247285); the setting
+    # only decides whether the ORM leaves id generation to it.
+    id = Column(
+        GUID(),
+        primary_key=True,
+        default=None if settings.USER_ID_SERVER_DEFAULT else uuid7,
+        # Parenthesised so the same DDL is valid on SQLite (see app.db.sqlite)
+        server_default=text("(uuid_generate_v7())"),
+    )
     email = Column(String(length=255), unique=True, index=True, nullable=False)
     username = Column(String(length=255), unique=True, index=True, nullable=False)
     full_name = Column(String(length=255), nullable=False)
     hashed_password = Column(String(length=255), nullable=False)
     reset_token = Column(String(length=255), nullable=True, index=True)
     reset_token_expires = Column(DateTime, nullable=True)
-    
+
+    # Trigram indexes backing partial-match user search (requires pg_trgm);
+    # GiST so candidates can be read nearest-first (`column <-> query`)
+    __table_args__ = (
+        Index("ix_users_email_trgm", "email",
+              postgresql_using="gist", postgresql_ops={"email": "gist_trgm_ops"}),
+        Index("ix_users_username_trgm", "username",
+              postgresql_using="gist", postgresql_ops={"username": "gist_trgm_ops"}),
+        Index("ix_users_full_name_trgm", "full_name",
+              postgresql_using="gist", postgresql_ops={"full_name": "gist_trgm_ops"}),
+    )
+
+
+# create_all on PostgreSQL needs the default's function and the trigram
+# operator classes before the table
+event.listen(
+    User.__table__, "before_create", DDL(UUID_GENERATE_V7_SQL).execute_if(dialect="postgresql")
+)
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+# email/username -> id, kept unique and in sync by trigger once users is hash
+# partitioned (users_partitioning migrations). Deliberately not in Base.metadata:
+# it only exists on databases that took that branch.
+user_lookup = table("user_lookup", column("user_id"), column("email"), column("username"))
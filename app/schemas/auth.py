@@ -48,3 +48,8 @@ class ResetPassword(BaseModel):
     token: str
     new_password: str
 
+
+class Availability(BaseModel):
+    # None when the value was not asked about
+    email: bool | None = None
+    username: bool | None = None
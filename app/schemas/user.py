@@ -15,3 +15,8 @@ class UserRead(BaseModel):
     full_name: str
 
     model_config = {"from_attributes": True}
+
+
+class UserSearchPage(BaseModel):
+    items: list[UserRead]
+    next_cursor: str | None = None
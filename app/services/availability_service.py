@@ -0,0 +1,176 @@
+"""Email/username availability checks backed by per-worker Bloom filters.
+
+Each worker keeps one Bloom filter of normalised emails and one of
+normalised usernames. A filter miss proves the value is not taken, so most
+"is this free?" checks from the sign-up form never reach the database; only
+possible hits are confirmed with an indexed lookup.
+
+The filters are built by a streaming scan of `users` and rebuilt every
+AVAILABILITY_FILTER_REBUILD_INTERVAL seconds; users created through this
+worker are added immediately. Users created by other workers since the last
+rebuild can be reported as available, so the answer is advisory and
+/auth/register still enforces uniqueness.
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.timing import phase
+from app.db.session import SessionLocal
+from app.models.user import User, user_lookup
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(value: str) -> str:
+    # Case-folding can only merge values, so a filter built on normalised
+    # values still never misses an exact match
+    return value.strip().lower()
+
+
+class AvailabilityIndex:
+    """Per-worker Bloom filters over existing emails and usernames."""
+
+    def __init__(self):
+        self.emails: BloomFilter | None = None
+        self.usernames: BloomFilter | None = None
+        self.built_at: float | None = None
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, str]] | None = None
+        self.filter_negatives = 0
+        self.filter_positives = 0
+        self.false_positives = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.emails is not None
+
+    def note_user(self, email: str, username: str) -> None:
+        """Add a newly created user so it is never reported as available."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((email, username))
+            emails, usernames = self.emails, self.usernames
+        if emails is not None:
+            emails.add(normalize(email))
+            usernames.add(normalize(username))
+
+    def rebuild(self) -> None:
+        """Build fresh filters with a streaming scan of users and swap them in."""
+        started = time.monotonic()
+        with self._lock:
+            # Users created during the scan might be missed by it; replay them after
+            self._pending = []
+        try:
+            db = SessionLocal()
+            try:
+                total = db.execute(select(func.count()).select_from(User)).scalar_one()
+                capacity = max(settings.AVAILABILITY_FILTER_MIN_CAPACITY, total * 2)
+                emails = BloomFilter(capacity, settings.AVAILABILITY_FILTER_ERROR_RATE)
+                usernames = BloomFilter(capacity, settings.AVAILABILITY_FILTER_ERROR_RATE)
+                source = user_lookup.c if settings.USERS_PARTITIONED else User
+                rows = db.execute(
+                    select(source.email, source.username).execution_options(yield_per=10_000)
+                )
+                for email, username in rows:
+                    emails.add(normalize(email))
+                    usernames.add(normalize(username))
+            finally:
+                db.close()
+
+            with self._lock:
+                for email, username in self._pending:
+                    emails.add(normalize(email))
+                    usernames.add(normalize(username))
+                self.emails, self.usernames = emails, usernames
+                self.built_at = time.time()
+        finally:
+            with self._lock:
+                self._pending = None
+
+        logger.info(
+            "Availability filters built",
+            extra={"users": total, "seconds": round(time.monotonic() - started, 3), **self.stats()},
+        )
+
+    def might_contain(self, bloom: BloomFilter | None, value: str) -> bool:
+        if bloom is None:
+            return True
+        if normalize(value) in bloom:
+            self.filter_positives += 1
+            return True
+        self.filter_negatives += 1
+        return False
+
+    def stats(self) -> dict:
+        """Memory footprint, expected and observed false-positive rates."""
+        report = {
+            "ready": self.ready,
+            "built_at": self.built_at,
+            "filter_negatives": self.filter_negatives,
+            "filter_positives": self.filter_positives,
+            "false_positives": self.false_positives,
+            "observed_false_positive_rate": (
+                self.false_positives / (self.filter_negatives + self.false_positives)
+                if self.filter_negatives + self.false_positives else 0.0
+            ),
+        }
+        for name, bloom in (("emails", self.emails), ("usernames", self.usernames)):
+            if bloom is not None:
+                report[name] = {
+                    "items": bloom.count,
+                    "capacity": bloom.capacity,
+                    "memory_bytes": bloom.memory_bytes,
+                    "hashes": bloom.num_hashes,
+                    "expected_false_positive_rate": bloom.estimated_error_rate(),
+                }
+        return report
+
+
+availability_index = AvailabilityIndex()
+
+
+def _is_taken(db: Session, name: str, value: str) -> bool:
+    if settings.USERS_PARTITIONED:
+        # The narrow unique table answers without touching any users partition
+        stmt = select(user_lookup.c.user_id).where(user_lookup.c[name] == value)
+    else:
+        stmt = select(User.id).where(getattr(User, name) == value)
+    return db.execute(stmt.limit(1)).first() is not None
+
+
+def is_email_available(db: Session, email: str) -> bool:
+    if not availability_index.might_contain(availability_index.emails, email):
+        return True
+    with phase("db"):
+        taken = _is_taken(db, "email", email)
+    if not taken and availability_index.ready:
+        availability_index.false_positives += 1
+    return not taken
+
+
+def is_username_available(db: Session, username: str) -> bool:
+    if not availability_index.might_contain(availability_index.usernames, username):
+        return True
+    with phase("db"):
+        taken = _is_taken(db, "username", username)
+    if not taken and availability_index.ready:
+        availability_index.false_positives += 1
+    return not taken
+
+
+async def rebuild_periodically() -> None:
+    """Background task: build the filters at startup, then refresh them on an interval."""
+    while True:
+        try:
+            # Plain thread, not the request threadpool, so a long scan never takes a request slot
+            await asyncio.to_thread(availability_index.rebuild)
+        except Exception:
+            logger.exception("Building availability filters failed")
+        await asyncio.sleep(settings.AVAILABILITY_FILTER_REBUILD_INTERVAL)
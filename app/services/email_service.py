@@ -1,7 +1,10 @@
 """Email service for sending emails like password reset links."""
+import logging
 from typing import Optional
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def send_password_reset_email(email: str, reset_token: str, reset_url: Optional[str] = None) -> bool:
     """
@@ -55,9 +58,9 @@ def send_password_reset_email(email: str, reset_token: str, reset_url: Optional[
         reset_url = f"http://localhost:8000/reset-password?token={reset_token}"
     
     # TODO: Implement actual email sending
-    # For now, we'll just log the reset link (in production, remove this)
-    print(f"[EMAIL SERVICE] Password reset link for {email}: {reset_url}")
-    print(f"[EMAIL SERVICE] Reset token: {reset_token}")
+    # For now, we only log that a reset was requested. The link and token are
+    # never logged; in development they are returned by /auth/forgot-password.
+    logger.info("Password reset email requested", extra={"email": email})
     
     # In a real implementation, you would:
     # 1. Connect to your email service (SMTP, SendGrid, etc.)
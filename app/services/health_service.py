@@ -0,0 +1,156 @@
+"""Startup warm-up and the cached database readiness state behind /readyz.
+
+`warm_up` runs once per worker before it takes traffic: it opens
+DB_POOL_WARMUP pooled connections so the first requests skip connection setup,
+and runs each user_service query once so SQLAlchemy's compiled-statement cache
+is already filled.
+
+`readiness` is refreshed by `check_readiness_periodically` every
+READINESS_CHECK_INTERVAL seconds; /readyz only reads it, so probes never touch
+the database. The check has a connection of its own, so a request pool
+saturated by slow requests does not make a busy worker look down. A failed
+check that looks like a dropped connection also disposes the request pool, so
+stale connections are replaced even with DB_POOL_PRE_PING off.
+"""
+import asyncio
+import logging
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import SessionLocal, create_db_engine, engine
+from app.services import user_service
+
+logger = logging.getLogger(__name__)
+
+
+def warm_pool(bind: Engine, connections: int) -> int:
+    """Open up to `connections` pooled connections at once; returns how many were opened."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = bind.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        # Checked back in, so they stay open in the pool
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+def prime_statement_cache() -> None:
+    """Run each user_service lookup once with values that match no row."""
+    unused = f"warmup-{uuid.uuid4().hex}"
+    db = SessionLocal()
+    try:
+        user_service.get_user(db, uuid.UUID(int=0))
+        user_service.get_user_by_email(db, unused)
+        user_service.get_user_by_username(db, unused)
+        user_service.search_users(db, unused, limit=1)
+        # The cursor adds a keyset predicate, which makes it a separate statement
+        cursor = user_service._encode_search_cursor(1.0, uuid.UUID(int=0))
+        user_service.search_users(db, unused, limit=1, cursor=cursor)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def warm_up() -> None:
+    """Pre-open pool connections and prime the statement cache; never fails startup."""
+    started = time.monotonic()
+    try:
+        # Connections beyond pool_size would be closed again on check-in
+        opened = warm_pool(engine, min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
+        prime_statement_cache()
+    except Exception:
+        logger.exception("Warm-up failed; continuing with a cold pool")
+        return
+    logger.info(
+        "Warm-up done",
+        extra={"connections": opened, "seconds": round(time.monotonic() - started, 3)},
+    )
+
+
+class Readiness:
+    """Outcome of the latest background database check."""
+
+    def __init__(self):
+        self.ok = False
+        self.checked_at: float | None = None
+        self.error: str | None = None
+
+    def check(self, bind: Engine, requests: Engine | None = None) -> None:
+        """Run SELECT 1 on `bind`; a dropped connection also disposes the `requests` pool."""
+        try:
+            # A dropped connection fails once and invalidates the pool; the retry
+            # then gets a fresh connection, so only a real outage reports failure
+            for attempt in range(2):
+                try:
+                    with bind.connect() as conn:
+                        conn.execute(text("SELECT 1"))
+                    break
+                except Exception as exc:
+                    if getattr(exc, "connection_invalidated", False) and requests is not None:
+                        # Its idle connections most likely went with the same server or proxy
+                        requests.dispose()
+                    if attempt:
+                        raise
+        except Exception as exc:
+            if self.ok:
+                logger.warning("Database became unreachable", extra={"error": str(exc)})
+            # Only the exception type: /readyz is unauthenticated and must not leak hosts
+            self.ok, self.error = False, type(exc).__name__
+        else:
+            if not self.ok and self.checked_at is not None:
+                logger.info("Database reachable again")
+            self.ok, self.error = True, None
+        self.checked_at = time.monotonic()
+
+    def is_ready(self) -> bool:
+        # A check loop that stopped or hangs must not keep reporting ready
+        max_age = 3 * settings.READINESS_CHECK_INTERVAL
+        return self.ok and self.checked_at is not None and time.monotonic() - self.checked_at <= max_age
+
+    def report(self) -> dict:
+        return {
+            "status": "ready" if self.is_ready() else "unavailable",
+            "checked_seconds_ago": (
+                round(time.monotonic() - self.checked_at, 3) if self.checked_at is not None else None
+            ),
+            "error": self.error,
+        }
+
+
+readiness = Readiness()
+
+
+def _check_engine() -> Engine:
+    """
+    A one-connection engine for the readiness check, separate from the request pool.
+
+    Waiting for a connection from a pool saturated by slow requests (up to its
+    pool_timeout) would time the check out and take a healthy, busy worker
+    out of rotation, and under fleet-wide load every worker at once.
+    """
+    return create_db_engine(pool_size=1, max_overflow=0, pool_timeout=settings.READINESS_CHECK_TIMEOUT)
+
+
+async def check_readiness_periodically() -> None:
+    """Background task: refresh `readiness` every READINESS_CHECK_INTERVAL seconds."""
+    bind = _check_engine()
+    pending: asyncio.Future | None = None
+    while True:
+        # A thread stuck on an unreachable database cannot be cancelled; keep
+        # waiting on it rather than piling up another blocked thread per interval
+        if pending is None or pending.done():
+            pending = asyncio.ensure_future(asyncio.to_thread(readiness.check, bind, engine))
+        try:
+            await asyncio.wait_for(asyncio.shield(pending), settings.READINESS_CHECK_TIMEOUT)
+        except asyncio.TimeoutError:
+            readiness.ok, readiness.error = False, "check timed out"
+            readiness.checked_at = time.monotonic()
+        await asyncio.sleep(settings.READINESS_CHECK_INTERVAL)
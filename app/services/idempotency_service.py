@@ -0,0 +1,108 @@
+"""Storage for Idempotency-Key request outcomes."""
+from datetime import datetime, timedelta
+from typing import Tuple
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+
+def get_idempotency_record(db: Session, route: str, key: str) -> IdempotencyKey | None:
+    """Return the live (unexpired) record for a key, if any."""
+    return db.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.route == route,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > datetime.utcnow(),
+        )
+    ).scalar_one_or_none()
+
+
+def claim_idempotency_key(
+    db: Session,
+    route: str,
+    key: str,
+    request_hash: str
+) -> Tuple[bool, IdempotencyKey | None]:
+    """
+    Try to become the request that processes this key.
+
+    Inserts an in-progress record; the primary key makes this atomic across
+    workers. An expired record, or an in-progress one abandoned for longer
+    than IDEMPOTENCY_LOCK_TIMEOUT (e.g. its worker died), is replaced.
+
+    Returns:
+        tuple: (True, None) if claimed, otherwise (False, existing record)
+    """
+    for _ in range(2):
+        now = datetime.utcnow()
+        db.add(IdempotencyKey(
+            route=route,
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+        ))
+        try:
+            db.commit()
+            return True, None
+        except IntegrityError:
+            db.rollback()
+
+        stale = db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.route == route,
+                IdempotencyKey.key == key,
+                or_(
+                    IdempotencyKey.expires_at <= now,
+                    and_(
+                        IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.created_at
+                        < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT),
+                    ),
+                ),
+            )
+        ).rowcount
+        db.commit()
+        if not stale:
+            break
+
+    return False, get_idempotency_record(db, route, key)
+
+
+def complete_idempotency_key(
+    db: Session,
+    route: str,
+    key: str,
+    status_code: int,
+    response_body: bytes
+) -> None:
+    """Store the final response for a claimed key."""
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.route == route, IdempotencyKey.key == key)
+        .values(status_code=status_code, response_body=response_body)
+    )
+    db.commit()
+
+
+def release_idempotency_key(db: Session, route: str, key: str) -> None:
+    """Forget a claimed key whose request failed, so a retry can run it again."""
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.route == route,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+        )
+    )
+    db.commit()
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    """Delete expired records; returns the number removed."""
+    deleted = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return deleted
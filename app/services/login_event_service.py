@@ -0,0 +1,161 @@
+"""Asynchronous, batched recording of login attempts.
+
+Login handlers call `record_login_event`, which only appends to a bounded
+in-memory buffer. A background thread drains the buffer and writes the events
+with one multi-row INSERT per batch on its own connection, so logins never
+wait on (or commit for) the audit write. When the buffer is full, events are
+dropped and counted rather than slowing logins down.
+"""
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.db.session import create_db_engine
+from app.models.login_event import LoginEvent
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class LoginEventWriter:
+    """Buffer login events and flush them in batches by size or age."""
+
+    def __init__(self, bind: Engine, max_buffer: int, batch_size: int, flush_interval: float):
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_buffer)
+        self._thread: threading.Thread | None = None
+        self._conn: Connection | None = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, event: dict) -> bool:
+        """Buffer an event without blocking; False if it was dropped."""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="login-event-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything buffered so far and stop the writer thread."""
+        if self._thread is None:
+            return
+        # Blocking put: the sentinel must not be dropped when the buffer is full
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+        # Drain whatever arrived after the stop request
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        for start in range(0, len(leftovers), self.batch_size):
+            self._write(leftovers[start:start + self.batch_size])
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write(self, batch: list[dict]) -> None:
+        try:
+            if self._conn is None:
+                # Held for the writer's lifetime; `bind` has a pool of its own (see _writer_engine)
+                self._conn = self.bind.connect()
+            # executemany of a Core insert is sent as multi-row INSERT ... VALUES
+            self._conn.execute(insert(LoginEvent.__table__), batch)
+            self._conn.commit()
+            self.written += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Writing login events failed", extra={"events": len(batch)})
+            if self._conn is not None:
+                self._conn.invalidate()
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+def _writer_engine() -> Engine:
+    """
+    A one-connection engine for the writer, separate from the request pool.
+
+    The writer holds its connection permanently, so taking it from the request
+    pool would cost a request slot, and invalidating that pool after a
+    dropped connection would not concern the writer.
+    """
+    return create_db_engine(pool_size=1, max_overflow=0)
+
+
+login_event_writer = LoginEventWriter(
+    _writer_engine(),
+    max_buffer=settings.LOGIN_EVENTS_BUFFER_SIZE,
+    batch_size=settings.LOGIN_EVENTS_BATCH_SIZE,
+    flush_interval=settings.LOGIN_EVENTS_FLUSH_INTERVAL,
+)
+
+
+def record_login_event(
+    identifier: str,
+    outcome: str,
+    user_id: uuid.UUID | None = None,
+    ip_address: str | None = None
+) -> bool:
+    """Queue a login attempt for recording; returns False if it was dropped."""
+    return login_event_writer.record({
+        "user_id": user_id,
+        "identifier": identifier[:255],
+        "ip_address": ip_address,
+        "outcome": outcome,
+        "created_at": datetime.utcnow(),
+    })
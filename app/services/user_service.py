@@ -1,10 +1,26 @@
+import base64
+import json
 import uuid
 from datetime import datetime, timedelta
 from typing import Tuple
-from sqlalchemy.orm import Session
-from app.models.user import User
+from sqlalchemy import Float, and_, cast, func, or_, select, union
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql.functions import FunctionElement
+from app.models.user import User, user_lookup
 from app.schemas.user import UserCreate
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
+from app.core.singleflight import SingleFlight
+from app.core.timing import phase
+from app.db.session import engine
+from app.services.availability_service import availability_index
+from app.services.login_event_service import record_login_event
+
+# Concurrent identical lookups in this worker share one SELECT
+user_lookups = SingleFlight("user_lookups")
 
 
 def create_user(db: Session, user_in: UserCreate) -> User:
@@ -12,30 +28,194 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
+    availability_index.note_user(user.email, user.username)
     return user
 
 
-import uuid
+def _identifier_matches(name: str, value: str):
+    """Criterion for User.<name> == value that reads one partition when users is partitioned."""
+    if not settings.USERS_PARTITIONED:
+        return getattr(User, name) == value
+    # users is partitioned by id only; resolving the id through user_lookup first
+    # lets PostgreSQL prune the scan to one partition at execution time
+    return User.id == (
+        select(user_lookup.c.user_id).where(user_lookup.c[name] == value).scalar_subquery()
+    )
+
+
+def _select_user_row(*criteria) -> RowMapping | None:
+    # Runs on its own short-lived connection, never a caller's Session: the
+    # shared call may outlive (or run in another thread than) the request that
+    # started it, and followers must not read through that request's transaction
+    with engine.connect() as conn:
+        return conn.execute(select(User.__table__).where(*criteria).limit(1)).mappings().first()
+
+
+def _attach_user(db: Session, row: RowMapping | None) -> User | None:
+    """
+    Turn a (possibly shared) users row into a User owned by this session.
+
+    Single-flight hands the same row to several requests, so each one builds its
+    own instance and attaches it without another query; callers can then modify
+    and commit it as if they had loaded it themselves.
+    """
+    if row is None:
+        return None
+    existing = db.identity_map.get(identity_key(User, row["id"]))
+    if existing is not None:
+        return existing
+    user = User(**row)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
 
 def get_user(db: Session, user_id: uuid.UUID) -> User | None:
-    return db.get(User, user_id)
+    with phase("db"):
+        row = user_lookups.do(("get_user", user_id), _select_user_row, User.id == user_id)
+    return _attach_user(db, row)
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
-    return db.query(User).filter(User.email == email).first()
+    with phase("db"):
+        row = user_lookups.do(
+            ("get_user_by_email", email), _select_user_row, _identifier_matches("email", email)
+        )
+    return _attach_user(db, row)
+
+
+async def get_user_by_email_async(db: Session, email: str) -> User | None:
+    """Like get_user_by_email, for async callers; the query runs in the threadpool."""
+    with phase("db"):
+        row = await user_lookups.do_async(
+            ("get_user_by_email", email), _select_user_row, _identifier_matches("email", email)
+        )
+    return _attach_user(db, row)
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
-    return db.query(User).filter(User.username == username).first()
+    with phase("db"):
+        return db.query(User).filter(_identifier_matches("username", username)).first()
+
+
+def _encode_search_cursor(score: float, user_id: uuid.UUID) -> str:
+    raw = json.dumps([score, str(user_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_search_cursor(cursor: str) -> Tuple[float, uuid.UUID]:
+    try:
+        score, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), uuid.UUID(user_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid search cursor")
+
+
+class _trigram_distance(FunctionElement):
+    """`a <-> b`, pg_trgm's distance (1 - similarity), which GiST trigram indexes return in order."""
+    type = Float(precision=53)
+    inherit_cache = True
+
+
+@compiles(_trigram_distance)
+def _compile_trigram_distance(element, compiler, **kw):
+    # Same ordering anywhere similarity() exists (SQLite, see app.db.sqlite), without an index
+    return f"(1 - similarity({compiler.process(element.clauses, **kw)}))"
 
 
-def authenticate_user(db: Session, identifier: str, password: str) -> User | None:
-    """Authenticate a user by email or username and password."""
+@compiles(_trigram_distance, "postgresql")
+def _compile_trigram_distance_pg(element, compiler, **kw):
+    left, right = element.clauses
+    return f"{compiler.process(left, **kw)} <-> {compiler.process(right, **kw)}"
+
+
+def search_users(
+    db: Session,
+    query: str,
+    limit: int,
+    cursor: str | None = None
+) -> Tuple[list[User], str | None]:
+    """
+    Search users by partial email, username or full name.
+
+    Matches are ranked by trigram similarity and paginated with a (score, id)
+    keyset cursor.
+
+    Scoring every match of a broad term would be unbounded, so the candidates
+    are read from the pg_trgm GiST indexes nearest-first: for each column, the
+    USER_SEARCH_MAX_CANDIDATES closest rows whose value contains the term. The
+    best matches are always among them (an exact username is first in its
+    list); only matches ranked beyond that many are not returned, and callers
+    should narrow the query to reach them.
+
+    Returns:
+        tuple: (matching users, cursor for the next page or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    # Compare as double precision so the score survives the cursor round trip exactly
+    score = cast(
+        func.greatest(
+            func.similarity(User.email, query),
+            func.similarity(User.username, query),
+            func.similarity(User.full_name, query),
+        ),
+        Float(precision=53),
+    )
+
+    nearest = []
+    for column in (User.email, User.username, User.full_name):
+        closest = (
+            select(User.id)
+            .where(column.ilike(pattern, escape="\\"))
+            .order_by(_trigram_distance(column, query))
+            .limit(settings.USER_SEARCH_MAX_CANDIDATES)
+            .subquery()
+        )
+        # Wrapped so each part keeps its own ORDER BY/LIMIT inside the UNION
+        nearest.append(select(closest.c.id))
+    candidates = union(*nearest).subquery()
+    stmt = select(User, score.label("score")).join(candidates, candidates.c.id == User.id)
+    if cursor is not None:
+        last_score, last_id = _decode_search_cursor(cursor)
+        stmt = stmt.where(
+            or_(score < last_score, and_(score == last_score, User.id > last_id))
+        )
+    # Fetch one extra row to know whether another page exists
+    stmt = stmt.order_by(score.desc(), User.id).limit(limit + 1)
+
+    with phase("db"):
+        rows = db.execute(stmt).all()
+    users = [row.User for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_search_cursor(last.score, last.User.id)
+    return users, next_cursor
+
+
+def authenticate_user(
+    db: Session,
+    identifier: str,
+    password: str,
+    ip_address: str | None = None
+) -> User | None:
+    """
+    Authenticate a user by email or username and password.
+
+    Every attempt is queued for the login_events table; recording never blocks.
+    """
     user = get_user_by_email(db, identifier) or get_user_by_username(db, identifier)
     if not user:
+        record_login_event(identifier, "unknown_user", ip_address=ip_address)
         return None
     if not verify_password(password, user.hashed_password):
+        record_login_event(identifier, "bad_password", user_id=user.id, ip_address=ip_address)
         return None
+    record_login_event(identifier, "success", user_id=user.id, ip_address=ip_address)
     return user
 
 
@@ -54,9 +234,11 @@ def create_user_with_password(
         hashed_password=hashed_password,
         full_name=full_name
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    with phase("db"):
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    availability_index.note_user(user.email, user.username)
     return user
 
 
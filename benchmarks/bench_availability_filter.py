@@ -0,0 +1,49 @@
+"""Measure the availability Bloom filter on synthetic usernames.
+
+Fills a filter sized like the per-worker one with --users taken usernames,
+then probes --probes names that were never added and reports memory, the
+observed false-positive rate (each one costs a database query) against the
+configured target, and add/lookup latency. Needs no database.
+
+Usage:
+    python -m benchmarks.bench_availability_filter --users 1000000 --probes 200000
+"""
+import argparse
+import time
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=200_000)
+    parser.add_argument("--error-rate", type=float, default=settings.AVAILABILITY_FILTER_ERROR_RATE)
+    args = parser.parse_args()
+
+    # Same sizing rule as AvailabilityIndex.rebuild: room for the table to double
+    capacity = max(settings.AVAILABILITY_FILTER_MIN_CAPACITY, args.users * 2)
+    bloom = BloomFilter(capacity, args.error_rate)
+
+    started = time.perf_counter()
+    for i in range(args.users):
+        bloom.add(f"user{i}")
+    add_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    false_positives = sum(1 for i in range(args.probes) if f"free{i}" in bloom)
+    lookup_seconds = time.perf_counter() - started
+
+    print(f"users          {args.users}")
+    print(f"capacity       {capacity} ({bloom.num_hashes} hashes)")
+    print(f"memory         {bloom.memory_bytes / 1024 / 1024:.2f} MiB "
+          f"({bloom.memory_bytes * 8 / args.users:.1f} bits/user)")
+    print(f"fp rate        {false_positives / args.probes:.4%} observed, "
+          f"{bloom.estimated_error_rate():.4%} expected, {args.error_rate:.2%} at capacity")
+    print(f"add            {add_seconds / args.users * 1e6:.2f} us/item")
+    print(f"lookup         {lookup_seconds / args.probes * 1e6:.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Latency of the auth and users hot paths, fully in-process on SQLite.
+
+Runs the real app (middleware, dependencies, services) through TestClient
+against a throwaway SQLite database bootstrapped with init_db, so it needs no
+outside services and gives repeatable numbers in CI. Set DATABASE_URL to a
+sqlite:///file.db URL to keep the database, or to PostgreSQL to compare.
+
+    --profile  also print the top cProfile entries for each path
+
+Usage:
+    python -m benchmarks.bench_hot_paths --users 200 --requests 500
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_BOOTSTRAP_SCHEMA", "true")
+os.environ.setdefault("SERVER_TIMING_LOG_SAMPLE_RATE", "0")
+os.environ.setdefault("LOAD_SHED_ENABLED", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def measure(name: str, calls, profile: bool) -> None:
+    profiler = cProfile.Profile() if profile else None
+    timings = []
+    for call in calls:
+        if profiler:
+            profiler.enable()
+        started = time.perf_counter()
+        response = call()
+        timings.append((time.perf_counter() - started) * 1000)
+        if profiler:
+            profiler.disable()
+        if response.status_code >= 400:
+            raise SystemExit(f"{name}: HTTP {response.status_code} {response.text}")
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:<14} n={len(timings):<6} mean {statistics.fmean(timings):7.2f} ms   "
+          f"p50 {timings[len(timings) // 2]:7.2f} ms   p99 {p99:7.2f} ms")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        def register(i: int):
+            return lambda: client.post("/api/v1/auth/register", json={
+                "email": f"user{i}@bench.example", "username": f"user{i}",
+                "password": "bench-password", "full_name": f"Bench User {i}",
+            })
+
+        measure("register", [register(i) for i in range(args.users)], args.profile)
+
+        login = lambda: client.post(  # noqa: E731
+            "/api/v1/auth/login", json={"username": "user0", "password": "bench-password"}
+        )
+        measure("login", [login] * min(args.requests, 50), args.profile)
+
+        headers = {"Authorization": f"Bearer {login().json()['access_token']}"}
+        me = client.get("/api/v1/users/me", headers=headers).json()
+        measure("users/me", [lambda: client.get("/api/v1/users/me", headers=headers)] * args.requests,
+                args.profile)
+        measure("users/{id}",
+                [lambda: client.get(f"/api/v1/users/{me['id']}", headers=headers)] * args.requests,
+                args.profile)
+        measure("users/search",
+                [lambda: client.get("/api/v1/users/search?q=user1", headers=headers)] * args.requests,
+                args.profile)
+        measure("availability",
+                [lambda: client.get("/api/v1/auth/availability?username=free-name")] * args.requests,
+                args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Saturation benchmark for LoadSheddingMiddleware.
+
+Drives a stand-in app whose endpoints block a worker thread like the real ones
+(short `users` reads, long bcrypt-bound `auth` calls) with an open-loop request
+rate from below to well past capacity, with and without the load shedder.
+Goodput counts successful responses that arrived before the client timeout;
+responses after the timeout are work nobody waited for.
+
+Usage:
+    python -m benchmarks.bench_load_shedding --threads 8 --duration 5
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import RouteBudget
+from app.middleware.load_shedding import ConcurrencyLimiter, LoadSheddingMiddleware
+
+USERS_COST = 0.01
+AUTH_COST = 0.08
+AUTH_SHARE = 0.2
+
+
+def build_app(shed: bool, threads: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/users/me")
+    def users_me():
+        time.sleep(USERS_COST)
+        return {"ok": True}
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        time.sleep(AUTH_COST)
+        return {"ok": True}
+
+    if shed:
+        limiter = ConcurrencyLimiter(
+            {
+                "users": RouteBudget(prefix="/api/v1/users", max_in_flight=threads,
+                                     max_queued=threads * 2, queue_timeout=0.2, priority=0),
+                "auth": RouteBudget(prefix="/api/v1/auth", max_in_flight=max(1, threads // 2),
+                                    max_queued=threads, queue_timeout=0.5, priority=1),
+            },
+            max_in_flight=threads,
+        )
+        app.add_middleware(LoadSheddingMiddleware, limiter=limiter)
+    return app
+
+
+async def run_load(app: FastAPI, rate: float, duration: float, timeout: float) -> dict[str, float]:
+    counts = {"ok": 0, "shed": 0, "late": 0, "late_ok": 0}
+    pending: list[asyncio.Task] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            if random.random() < AUTH_SHARE:
+                request = client.post("/api/v1/auth/login")
+            else:
+                request = client.get("/api/v1/users/me")
+            task = asyncio.ensure_future(request)
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if not done:
+                counts["late"] += 1
+                # Let it finish in the background: the server still does the work
+                response = await task
+                counts["late_ok"] += response.status_code == 200
+                return
+            response = task.result()
+            counts["ok" if response.status_code == 200 else "shed"] += 1
+
+        start = time.perf_counter()
+        sent = 0
+        while (elapsed := time.perf_counter() - start) < duration:
+            due = int(elapsed * rate)
+            while sent < due:
+                pending.append(asyncio.ensure_future(one()))
+                sent += 1
+            await asyncio.sleep(0.001)
+        await asyncio.gather(*pending)
+    counts["goodput"] = counts["ok"] / duration
+    return counts
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+    mean_cost = AUTH_SHARE * AUTH_COST + (1 - AUTH_SHARE) * USERS_COST
+    capacity = args.threads / mean_cost
+    print(f"threads={args.threads} approx capacity={capacity:.0f} req/s, client timeout={args.timeout}s")
+    for load in args.loads:
+        rate = capacity * load
+        for shed in (False, True):
+            counts = await run_load(build_app(shed, args.threads), rate, args.duration, args.timeout)
+            print(
+                f"load {load:>4.1f}x ({rate:6.0f} req/s) shed={str(shed):5}  "
+                f"goodput={counts['goodput']:7.1f} req/s  ok={counts['ok']:6}  "
+                f"503={counts['shed']:6}  late={counts['late']:6} (wasted={counts['late_ok']})"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--loads", type=float, nargs="+", default=[0.5, 0.9, 1.5, 2.0, 4.0])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure caller-side logging latency with a slow log sink.
+
+Compares three ways of emitting a diagnostic line while the sink takes
+--sink-delay seconds per write (a backed-up stdout pipe):
+
+    print      bare print() to the slow stream, as the code used to do
+    direct     a StreamHandler on the slow stream, synchronous
+    queue      app.core.logging: QueueHandler + background listener
+
+Usage:
+    python -m benchmarks.bench_logging --calls 2000 --sink-delay 0.002
+"""
+import argparse
+import io
+import logging
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.logging import JsonFormatter, dropped_records, setup_logging, shutdown_logging
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, s: str) -> int:
+        time.sleep(self.delay)
+        return super().write(s)
+
+
+def measure(emit, calls: int) -> list[float]:
+    samples = []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        emit(i)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+
+def report(name: str, samples: list[float]) -> None:
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{name:7} p50={statistics.median(samples):9.1f}us  p99={p99:9.1f}us  max={samples[-1]:9.1f}us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--sink-delay", type=float, default=0.002)
+    args = parser.parse_args()
+
+    stream = SlowStream(args.sink_delay)
+    report("print", measure(lambda i: print(f"[EMAIL SERVICE] reset requested {i}", file=stream), args.calls))
+
+    direct = logging.getLogger("bench.direct")
+    direct.setLevel(logging.INFO)
+    direct.propagate = False
+    handler = logging.StreamHandler(SlowStream(args.sink_delay))
+    handler.setFormatter(JsonFormatter())
+    direct.addHandler(handler)
+    report("direct", measure(lambda i: direct.info("reset requested", extra={"n": i}), args.calls))
+
+    setup_logging(SlowStream(args.sink_delay))
+    queued = logging.getLogger("app.bench")
+    report("queue", measure(lambda i: queued.info("reset requested", extra={"n": i}), args.calls))
+    print(f"queue dropped {dropped_records()} records (LOG_QUEUE_SIZE={settings.LOG_QUEUE_SIZE})")
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
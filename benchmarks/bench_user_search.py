@@ -0,0 +1,115 @@
+"""Benchmark user search against a seeded users table.
+
+Seeds synthetic users (tagged with the @bench.example domain) server-side with
+generate_series, then times `search_users` first pages, deep keyset pages and
+the plan PostgreSQL picks for the trigram filter.
+
+Usage:
+    python -m benchmarks.bench_user_search --rows 5000000
+    python -m benchmarks.bench_user_search --cleanup
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal, engine
+from app.services.user_service import search_users
+
+BENCH_DOMAIN = "bench.example"
+QUERIES = ["user12345", "bench", "Name 4242", "99999", "alice"]
+
+
+def seed(rows: int, batch: int = 500_000) -> None:
+    with engine.begin() as conn:
+        existing = conn.execute(
+            text("SELECT count(*) FROM users WHERE email LIKE :p"),
+            {"p": f"%@{BENCH_DOMAIN}"},
+        ).scalar_one()
+    print(f"existing bench rows: {existing}")
+    start = existing
+    while start < rows:
+        stop = min(start + batch, rows)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO users (id, email, username, full_name, hashed_password)
+                    SELECT gen_random_uuid(),
+                           'user' || g || '@' || :domain,
+                           'user' || g,
+                           'Bench Name ' || g,
+                           ''
+                    FROM generate_series(:start, :stop - 1) AS g
+                    """
+                ),
+                {"start": start, "stop": stop, "domain": BENCH_DOMAIN},
+            )
+        print(f"seeded {stop}/{rows}")
+        start = stop
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE users"))
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        deleted = conn.execute(
+            text("DELETE FROM users WHERE email LIKE :p"), {"p": f"%@{BENCH_DOMAIN}"}
+        ).rowcount
+    print(f"deleted {deleted} bench rows")
+
+
+def time_pages(query: str, limit: int, pages: int, repeat: int) -> None:
+    first, deep = [], []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            cursor = None
+            for page in range(pages):
+                t0 = time.perf_counter()
+                users, cursor = search_users(db, query, limit, cursor)
+                elapsed = (time.perf_counter() - t0) * 1000
+                (first if page == 0 else deep).append(elapsed)
+                if cursor is None:
+                    break
+        finally:
+            db.close()
+    line = f"{query!r:14} first p50={statistics.median(first):7.2f}ms"
+    if deep:
+        line += f"  later pages p50={statistics.median(deep):7.2f}ms (n={len(deep)})"
+    print(line)
+
+
+def explain(query: str) -> None:
+    with engine.connect() as conn:
+        plan = conn.execute(
+            text(
+                "EXPLAIN (ANALYZE, BUFFERS) SELECT id FROM users "
+                "WHERE email ILIKE :p OR username ILIKE :p OR full_name ILIKE :p"
+            ),
+            {"p": f"%{query}%"},
+        ).scalars().all()
+    print("\n".join(plan))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+    seed(args.rows)
+    for query in QUERIES:
+        time_pages(query, args.limit, args.pages, args.repeat)
+    explain(QUERIES[0])
+
+
+if __name__ == "__main__":
+    main()
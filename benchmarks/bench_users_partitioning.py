@@ -0,0 +1,153 @@
+"""Compare an unpartitioned users table with the hash-partitioned layout.
+
+Builds two scratch copies shaped like `users`:
+
+    bench_users_plain   unique email/username indexes, like users today
+    bench_users_hash    PARTITION BY HASH (id) + bench_user_lookup for email/username
+
+fills both with --rows rows, then reports:
+
+- mean lookup latency by id and by email (the email lookup on the partitioned
+  side goes through the lookup table, as get_user_by_email does)
+- partitions actually read by each lookup, from EXPLAIN ANALYZE
+- VACUUM time and largest index size: whole table vs one partition, which is
+  the unit autovacuum and REINDEX work on after partitioning
+
+Requires the uuid_generate_v7 migration to be applied.
+
+Usage:
+    python -m benchmarks.bench_users_partitioning --rows 50000000 --partitions 16
+"""
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+ROW_SQL = (
+    "SELECT uuid_generate_v7(), 'user' || g || '@bench.example', 'user' || g, "
+    "'User ' || g, 'x' FROM generate_series(:start, :stop - 1) AS g"
+)
+
+
+def setup(rows: int, partitions: int, batch: int) -> None:
+    with engine.begin() as conn:
+        for table in ("bench_users_plain", "bench_users_hash", "bench_user_lookup"):
+            conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+        conn.execute(text(
+            "CREATE TABLE bench_users_plain (id uuid PRIMARY KEY, email varchar(255) NOT NULL UNIQUE, "
+            "username varchar(255) NOT NULL UNIQUE, full_name varchar(255) NOT NULL, "
+            "hashed_password varchar(255) NOT NULL)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE bench_users_hash (id uuid PRIMARY KEY, email varchar(255) NOT NULL, "
+            "username varchar(255) NOT NULL, full_name varchar(255) NOT NULL, "
+            "hashed_password varchar(255) NOT NULL) PARTITION BY HASH (id)"
+        ))
+        for remainder in range(partitions):
+            conn.execute(text(
+                f"CREATE TABLE bench_users_hash_p{remainder:03d} PARTITION OF bench_users_hash "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            ))
+        conn.execute(text(
+            "CREATE TABLE bench_user_lookup (user_id uuid PRIMARY KEY, "
+            "email varchar(255) NOT NULL UNIQUE, username varchar(255) NOT NULL UNIQUE)"
+        ))
+
+    for start in range(0, rows, batch):
+        stop = min(start + batch, rows)
+        with engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO bench_users_plain {ROW_SQL}"), {"start": start, "stop": stop})
+        print(f"filled {stop}/{rows}", end="\r", flush=True)
+    print()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO bench_users_hash SELECT * FROM bench_users_plain"))
+        conn.execute(text(
+            "INSERT INTO bench_user_lookup SELECT id, email, username FROM bench_users_plain"
+        ))
+        for table in ("bench_users_plain", "bench_users_hash", "bench_user_lookup"):
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+QUERIES = {
+    "plain by id": "SELECT * FROM bench_users_plain WHERE id = :id",
+    "plain by email": "SELECT * FROM bench_users_plain WHERE email = :email",
+    "hash by id": "SELECT * FROM bench_users_hash WHERE id = :id",
+    "hash by email": (
+        "SELECT * FROM bench_users_hash WHERE id = "
+        "(SELECT user_id FROM bench_user_lookup WHERE email = :email)"
+    ),
+}
+
+
+def partitions_read(conn, sql: str, params: dict) -> int:
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    def walk(node) -> int:
+        own = int(
+            node.get("Relation Name", "").startswith("bench_users_hash_p")
+            and node.get("Actual Loops", 0) > 0
+        )
+        return own + sum(walk(child) for child in node.get("Plans", []))
+
+    return walk(plan[0]["Plan"])
+
+
+def bench_lookups(samples: int) -> None:
+    with engine.connect() as conn:
+        picked = conn.execute(
+            text("SELECT id, email FROM bench_users_plain TABLESAMPLE SYSTEM (1) LIMIT :n"),
+            {"n": samples},
+        ).all()
+        random.shuffle(picked)
+        for name, sql in QUERIES.items():
+            statement = text(sql)
+            started = time.perf_counter()
+            for row in picked:
+                conn.execute(statement, {"id": row.id, "email": row.email}).first()
+            mean = (time.perf_counter() - started) / len(picked) * 1000
+            read = (
+                partitions_read(conn, sql, {"id": picked[0].id, "email": picked[0].email})
+                if name.startswith("hash") else "-"
+            )
+            print(f"{name:<16} {mean:8.3f} ms/lookup   partitions read: {read}")
+
+
+def bench_maintenance() -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for label, table in (("whole table", "bench_users_plain"), ("one partition", "bench_users_hash_p000")):
+            started = time.perf_counter()
+            conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+            elapsed = time.perf_counter() - started
+            largest = conn.execute(
+                text(
+                    "SELECT max(pg_relation_size(indexrelid)) FROM pg_index "
+                    "WHERE indrelid = CAST(:t AS regclass)"
+                ),
+                {"t": table},
+            ).scalar()
+            print(f"{label:<16} vacuum {elapsed:7.2f} s   largest index {largest / 1024 / 1024:9.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--skip-setup", action="store_true", help="reuse tables from a previous run")
+    args = parser.parse_args()
+
+    if not args.skip_setup:
+        setup(args.rows, args.partitions, args.batch)
+    bench_lookups(args.lookups)
+    bench_maintenance()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare insert throughput and primary key index size for UUIDv4 vs UUIDv7 keys.
+
+Creates two scratch tables shaped like `users` (uuid primary key plus a
+payload), fills them in batches and reports rows/s per batch as the tables grow,
+then the final table and primary key index sizes.
+
+    --source server  ids come from gen_random_uuid() / uuid_generate_v7() (fast, default)
+    --source app     ids come from uuid.uuid4() / app.models.ids.uuid7() via executemany
+
+Requires the uuid_generate_v7 migration to be applied.
+
+Usage:
+    python -m benchmarks.bench_uuid_keys --rows 20000000
+"""
+import argparse
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.models.ids import uuid7
+
+TABLES = {
+    "v4": ("bench_ids_v4", "gen_random_uuid()", uuid.uuid4),
+    "v7": ("bench_ids_v7", "uuid_generate_v7()", uuid7),
+}
+
+
+def reset(table: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        conn.execute(text(f"CREATE TABLE {table} (id uuid PRIMARY KEY, payload varchar(255) NOT NULL)"))
+
+
+def insert_batch(table: str, server_fn: str, app_fn, source: str, start: int, size: int) -> None:
+    with engine.begin() as conn:
+        if source == "server":
+            conn.execute(
+                text(
+                    f"INSERT INTO {table} (id, payload) "
+                    f"SELECT {server_fn}, 'user' || g || '@bench.example' "
+                    f"FROM generate_series(:start, :stop - 1) AS g"
+                ),
+                {"start": start, "stop": start + size},
+            )
+        else:
+            conn.execute(
+                text(f"INSERT INTO {table} (id, payload) VALUES (:id, :payload)"),
+                [{"id": app_fn(), "payload": f"user{i}@bench.example"} for i in range(start, start + size)],
+            )
+
+
+def sizes(table: str) -> tuple[int, int]:
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT pg_relation_size(CAST(:t AS regclass)), "
+                "pg_relation_size(CAST(:i AS regclass))"
+            ),
+            {"t": table, "i": f"{table}_pkey"},
+        ).one()
+
+
+def run(kind: str, rows: int, batch: int, source: str, report_every: int) -> None:
+    table, server_fn, app_fn = TABLES[kind]
+    reset(table)
+    started = time.perf_counter()
+    window_start, window_rows = started, 0
+    for start in range(0, rows, batch):
+        size = min(batch, rows - start)
+        insert_batch(table, server_fn, app_fn, source, start, size)
+        window_rows += size
+        done = start + size
+        if done % report_every < batch or done == rows:
+            now = time.perf_counter()
+            print(f"{kind} {done:>12,} rows  {window_rows / (now - window_start):>10,.0f} rows/s")
+            window_start, window_rows = now, 0
+    total = time.perf_counter() - started
+    heap, index = sizes(table)
+    print(
+        f"{kind} total {total:.1f}s ({rows / total:,.0f} rows/s)  "
+        f"heap {heap / 2**20:,.0f} MiB  pkey index {index / 2**20:,.0f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--source", choices=["server", "app"], default="server")
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables")
+    args = parser.parse_args()
+
+    for kind in TABLES:
+        run(kind, args.rows, args.batch, args.source, args.report_every)
+    if not args.keep:
+        with engine.begin() as conn:
+            for table, _, _ in TABLES.values():
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Hermetic test setup: the whole app on a throwaway SQLite database.
+
+The environment is set before anything from `app` is imported, since settings
+and the engine are created at import time.
+"""
+import os
+import uuid
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["DB_BOOTSTRAP_SCHEMA"] = "true"
+os.environ["SERVER_TIMING_LOG_SAMPLE_RATE"] = "0"
+# The limiter has its own tests; here it would only turn slow runs into 503s
+os.environ["LOAD_SHED_ENABLED"] = "false"
+
+import bcrypt  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+# The lowest bcrypt cost keeps register/login fast; hashes stay real bcrypt
+_gensalt = bcrypt.gensalt
+bcrypt.gensalt = lambda rounds=4, prefix=b"2b": _gensalt(rounds, prefix)
+
+from app.main import app  # noqa: E402
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def new_user(client):
+    """Register a user with unique email/username; returns the request body."""
+    def register(**overrides) -> dict:
+        name = f"user-{uuid.uuid4().hex[:12]}"
+        body = {
+            "email": f"{name}@tests.example",
+            "username": name,
+            "password": PASSWORD,
+            "full_name": f"Test {name}",
+            **overrides,
+        }
+        response = client.post("/api/v1/auth/register", json=body)
+        assert response.status_code == 201, response.text
+        return body
+    return register
+
+
+@pytest.fixture
+def auth_headers(client, new_user):
+    user = new_user()
+    response = client.post(
+        "/api/v1/auth/login", json={"username": user["username"], "password": PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
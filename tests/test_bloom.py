@@ -0,0 +1,35 @@
+from app.core.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+    items = [f"user{i}@tests.example" for i in range(5_000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 5_000
+
+
+def test_false_positive_rate_is_near_the_target():
+    bloom = BloomFilter(capacity=5_000, error_rate=0.01)
+    for i in range(5_000):
+        bloom.add(f"member-{i}")
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(20_000))
+
+    assert false_positives / 20_000 < 0.03
+    assert 0.005 < bloom.estimated_error_rate() < 0.02
+
+
+def test_overfilled_filter_still_has_no_false_negatives():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    items = [f"name-{i}" for i in range(1_000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_empty_filter_contains_nothing():
+    assert "anything" not in BloomFilter(capacity=10)
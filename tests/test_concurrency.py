@@ -0,0 +1,75 @@
+"""The full stack under concurrent requests, as a threaded server would run it."""
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models.login_event import LoginEvent
+from app.services.login_event_service import login_event_writer
+from app.services.user_service import user_lookups
+from tests.conftest import PASSWORD
+
+THREADS = 16
+
+
+def _run(calls):
+    with ThreadPoolExecutor(THREADS) as pool:
+        return list(pool.map(lambda call: call(), calls))
+
+
+def test_concurrent_registers_and_logins(client):
+    prefix = uuid.uuid4().hex[:8]
+
+    def register(i):
+        return lambda: client.post("/api/v1/auth/register", json={
+            "email": f"{prefix}-{i}@tests.example", "username": f"{prefix}-{i}",
+            "password": PASSWORD, "full_name": f"Concurrent {i}",
+        })
+
+    def login(i):
+        return lambda: client.post(
+            "/api/v1/auth/login", json={"username": f"{prefix}-{i % 32}", "password": PASSWORD}
+        )
+
+    registered = _run([register(i) for i in range(32)])
+    assert [response.status_code for response in registered] == [201] * 32
+
+    # Logins of existing users mixed with new registrations
+    mixed = _run([login(i) if i % 2 else register(100 + i) for i in range(64)])
+    assert [response.status_code for response in mixed] == [201 if i % 2 == 0 else 200 for i in range(64)]
+
+    deadline = time.monotonic() + 10
+    while True:
+        db = SessionLocal()
+        try:
+            written = db.execute(
+                select(func.count()).select_from(LoginEvent).where(LoginEvent.identifier.like(f"{prefix}-%"))
+            ).scalar()
+        finally:
+            db.close()
+        if written == 32 or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    assert written == 32
+    assert login_event_writer.stats()["failed"] == 0
+
+
+def test_concurrent_lookups_of_one_user(client, new_user):
+    user = new_user()
+    token = client.post(
+        "/api/v1/auth/login", json={"username": user["username"], "password": PASSWORD}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    before = user_lookups.stats()
+
+    responses = _run([lambda: client.get(f"/api/v1/users/{user_id}", headers=headers)] * 64)
+
+    assert {response.status_code for response in responses} == {200}
+    assert {response.json()["username"] for response in responses} == {user["username"]}
+    after = user_lookups.stats()
+    # Each request looks the user up twice (token owner, then by id)
+    assert after["calls"] - before["calls"] == 128
+    assert after["in_flight"] == 0
@@ -0,0 +1,108 @@
+import uuid
+
+from app.api import idempotency
+from app.api.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from app.services.idempotency_service import claim_idempotency_key, get_idempotency_record
+
+REGISTER = "/api/v1/auth/register"
+ROUTE = f"POST {REGISTER}"
+
+
+def _body(**overrides) -> dict:
+    name = f"idem-{uuid.uuid4().hex[:12]}"
+    return {
+        "email": f"{name}@tests.example",
+        "username": name,
+        "password": "test-password",
+        "full_name": "Idempotent User",
+        **overrides,
+    }
+
+
+def _key() -> dict:
+    return {IDEMPOTENCY_HEADER: uuid.uuid4().hex}
+
+
+def test_retry_replays_the_first_response(client):
+    body, headers = _body(), _key()
+
+    first = client.post(REGISTER, json=body, headers=headers)
+    retry = client.post(REGISTER, json=body, headers=headers)
+
+    assert first.status_code == 201
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+
+
+def test_replay_is_served_from_the_table_after_the_cache(client):
+    body, headers = _body(), _key()
+    first = client.post(REGISTER, json=body, headers=headers)
+    idempotency._cache._items.clear()
+
+    retry = client.post(REGISTER, json=body, headers=headers)
+
+    assert retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+
+
+def test_reused_key_with_a_different_body_is_rejected(client):
+    headers = _key()
+    assert client.post(REGISTER, json=_body(), headers=headers).status_code == 201
+
+    response = client.post(REGISTER, json=_body(), headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_client_errors_are_stored_and_replayed(client, new_user):
+    taken = new_user()
+    body, headers = _body(email=taken["email"]), _key()
+
+    first = client.post(REGISTER, json=body, headers=headers)
+    retry = client.post(REGISTER, json=body, headers=headers)
+
+    assert first.status_code == 400
+    assert retry.status_code == 400
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+
+
+def test_requests_without_a_key_are_not_stored(client):
+    body = _body()
+
+    assert client.post(REGISTER, json=body).status_code == 201
+    assert client.post(REGISTER, json=body).status_code == 400
+
+
+def test_invalid_key_is_rejected(client):
+    response = client.post(REGISTER, json=_body(), headers={IDEMPOTENCY_HEADER: "x" * 256})
+
+    assert response.status_code == 400
+
+
+def test_storage_failure_keeps_the_real_response(client, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(idempotency, "complete_idempotency_key", fail)
+    headers = _key()
+
+    response = client.post(REGISTER, json=_body(), headers=headers)
+
+    assert response.status_code == 201
+    # Released, so a retry is not stuck behind an "in progress" key
+    assert idempotency._db_call(get_idempotency_record, ROUTE, headers[IDEMPOTENCY_HEADER]) is None
+
+
+def test_only_one_request_claims_a_key():
+    key = uuid.uuid4().hex
+
+    claimed, existing = idempotency._db_call(claim_idempotency_key, ROUTE, key, "hash")
+    claimed_again, record = idempotency._db_call(claim_idempotency_key, ROUTE, key, "hash")
+
+    assert (claimed, existing) == (True, None)
+    assert claimed_again is False
+    assert record.status_code is None
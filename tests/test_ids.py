@@ -0,0 +1,40 @@
+import threading
+import time
+import uuid
+
+from app.models.ids import uuid7
+
+
+def test_uuid7_layout():
+    before_ms = time.time_ns() // 1_000_000
+    value = uuid7()
+
+    assert isinstance(value, uuid.UUID)
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    # The counter may borrow a millisecond or two during bursts
+    assert before_ms <= value.int >> 80 <= time.time_ns() // 1_000_000 + 2
+
+
+def test_uuid7_is_strictly_increasing():
+    ids = [uuid7() for _ in range(20_000)]
+
+    assert all(a < b for a, b in zip(ids, ids[1:]))
+
+
+def test_uuid7_is_unique_across_threads():
+    results: list[list[uuid.UUID]] = []
+
+    def generate():
+        results.append([uuid7() for _ in range(5_000)])
+
+    threads = [threading.Thread(target=generate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [value for chunk in results for value in chunk]
+    assert len(set(ids)) == len(ids)
+    # Each thread still sees increasing ids
+    assert all(all(a < b for a, b in zip(chunk, chunk[1:])) for chunk in results)
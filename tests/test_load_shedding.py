@@ -0,0 +1,101 @@
+import asyncio
+
+from app.core.config import RouteBudget
+from app.middleware.load_shedding import ConcurrencyLimiter
+
+
+def _limiter(max_in_flight: int = 10, **budgets: RouteBudget) -> ConcurrencyLimiter:
+    return ConcurrencyLimiter(budgets, max_in_flight)
+
+
+def _budget(prefix: str, max_in_flight: int = 1, max_queued: int = 1,
+            queue_timeout: float = 1.0, priority: int = 0) -> RouteBudget:
+    return RouteBudget(prefix=prefix, max_in_flight=max_in_flight, max_queued=max_queued,
+                       queue_timeout=queue_timeout, priority=priority)
+
+
+def test_admits_queues_and_sheds():
+    limiter = _limiter(users=_budget("/users"))
+    group = limiter.match("/users/me")
+
+    async def main():
+        assert await limiter.acquire(group)
+        queued = asyncio.ensure_future(limiter.acquire(group))
+        await asyncio.sleep(0)
+        # The queue is full now
+        assert not await limiter.acquire(group)
+        limiter.release(group)
+        assert await queued
+        limiter.release(group)
+
+    asyncio.run(main())
+    assert limiter.stats()["users"] == {
+        "in_flight": 0, "queued": 0, "admitted": 2, "shed": 1, "timed_out": 0,
+    }
+
+
+def test_queued_request_times_out():
+    limiter = _limiter(users=_budget("/users", queue_timeout=0.05))
+    group = limiter.match("/users")
+
+    async def main():
+        assert await limiter.acquire(group)
+        assert not await limiter.acquire(group)
+
+    asyncio.run(main())
+    stats = limiter.stats()["users"]
+    assert (stats["in_flight"], stats["queued"], stats["timed_out"]) == (1, 0, 1)
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    limiter = _limiter(users=_budget("/users"))
+    group = limiter.match("/users")
+
+    async def main():
+        assert await limiter.acquire(group)
+        queued = asyncio.ensure_future(limiter.acquire(group))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        limiter.release(group)
+
+    asyncio.run(main())
+    stats = limiter.stats()["users"]
+    assert (stats["in_flight"], stats["queued"], stats["admitted"]) == (0, 0, 1)
+    assert limiter.in_flight == 0
+
+
+def test_freed_slots_go_to_the_highest_priority_group():
+    limiter = _limiter(
+        1,
+        auth=_budget("/auth", priority=1),
+        users=_budget("/users", priority=0),
+    )
+    auth, users = limiter.match("/auth/login"), limiter.match("/users/me")
+
+    async def main():
+        assert await limiter.acquire(auth)
+        auth_waiter = asyncio.ensure_future(limiter.acquire(auth))
+        users_waiter = asyncio.ensure_future(limiter.acquire(users))
+        await asyncio.sleep(0)
+        limiter.release(auth)
+        # Admission happens in release(); the waiter only resumes afterwards
+        assert (users.in_flight, auth.in_flight, len(auth.waiters)) == (1, 0, 1)
+        assert await users_waiter
+        limiter.release(users)
+        assert await auth_waiter
+        limiter.release(auth)
+
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+
+
+def test_longest_prefix_wins_regardless_of_priority():
+    limiter = _limiter(
+        auth=_budget("/api/v1/auth", priority=0),
+        availability=_budget("/api/v1/auth/availability", priority=2),
+    )
+
+    assert limiter.match("/api/v1/auth/availability").name == "availability"
+    assert limiter.match("/api/v1/auth/login").name == "auth"
+    assert limiter.match("/docs") is None
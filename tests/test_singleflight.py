@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    executions = []
+
+    def fn(value):
+        executions.append(value)
+        started.set()
+        release.wait(5)
+        return ("row", value)
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn, 1)))
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("k", fn, 1))) for _ in range(8)
+    ]
+    for thread in followers:
+        thread.start()
+    _wait_until(lambda: flight.stats()["collapsed"] == 8)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert executions == [1]
+    assert results == [("row", 1)] * 9
+    assert flight.stats() == {
+        "name": "test", "calls": 9, "executions": 1, "collapsed": 8, "in_flight": 0,
+    }
+
+
+def test_followers_receive_the_leaders_exception():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise LookupError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fn)
+        except LookupError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    _wait_until(lambda: flight.stats()["collapsed"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+
+
+def test_results_are_not_cached_after_the_call_finishes():
+    flight = SingleFlight("test")
+    counter = iter(range(10))
+
+    assert flight.do("k", lambda: next(counter)) == 0
+    assert flight.do("k", lambda: next(counter)) == 1
+    assert flight.stats()["executions"] == 2
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    assert flight.stats()["collapsed"] == 0
+
+
+def test_do_async_awaiters_share_one_execution():
+    flight = SingleFlight("test")
+    executions = []
+
+    def fn():
+        executions.append(1)
+        time.sleep(0.05)
+        return "row"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", fn) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["row"] * 5
+    assert executions == [1]
+    assert flight.stats()["collapsed"] == 4
+
+
+def test_cancelled_awaiter_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+
+    def fn():
+        time.sleep(0.1)
+        return "row"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("k", fn))
+        second = asyncio.ensure_future(flight.do_async("k", fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "row"
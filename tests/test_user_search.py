@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.services.user_service import _decode_search_cursor, _encode_search_cursor, search_users
+
+
+def test_cursor_round_trip_is_exact():
+    user_id = uuid.uuid4()
+    score = 0.1 + 0.2  # not exactly representable in fewer digits
+
+    assert _decode_search_cursor(_encode_search_cursor(score, user_id)) == (score, user_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24=", "WzEsICJub3QtYS11dWlkIl0="])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        _decode_search_cursor(cursor)
+
+
+def test_pages_cover_every_match_once_in_rank_order(client, new_user):
+    term = uuid.uuid4().hex[:8]
+    exact = new_user(username=term)
+    names = [exact["username"]] + [new_user(username=f"{term}-{'x' * i}")["username"] for i in range(7)]
+
+    db = SessionLocal()
+    try:
+        ranked, _ = search_users(db, term, limit=100)
+        pages, cursor = [], None
+        while True:
+            users, cursor = search_users(db, term, limit=3, cursor=cursor)
+            pages.append([user.username for user in users])
+            if cursor is None:
+                break
+    finally:
+        db.close()
+
+    assert len(pages) == 3
+    assert [name for page in pages for name in page] == [user.username for user in ranked]
+    assert sorted(user.username for user in ranked) == sorted(names)
+    assert ranked[0].username == exact["username"]
+
+
+def test_search_endpoint_pages_with_next_cursor(client, auth_headers, new_user):
+    term = uuid.uuid4().hex[:8]
+    for i in range(3):
+        new_user(full_name=f"Searchable {term} {i}")
+
+    first = client.get("/api/v1/users/search", params={"q": term, "limit": 2}, headers=auth_headers)
+    assert first.status_code == 200
+    page = first.json()
+    second = client.get(
+        "/api/v1/users/search",
+        params={"q": term, "limit": 2, "cursor": page["next_cursor"]},
+        headers=auth_headers,
+    ).json()
+
+    names = [user["full_name"] for user in page["items"] + second["items"]]
+    assert sorted(names) == [f"Searchable {term} {i}" for i in range(3)]
+    assert second["next_cursor"] is None
+
+
+def test_search_endpoint_rejects_a_bad_cursor(client, auth_headers):
+    response = client.get(
+        "/api/v1/users/search", params={"q": "abc", "cursor": "garbage"}, headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_search_candidates_are_capped_nearest_first(client, new_user, monkeypatch):
+    from app.core.config import settings
+
+    term = uuid.uuid4().hex[:8]
+    for i in range(5):
+        new_user(username=f"{term}-padding-{i}")
+    exact = new_user(username=term)
+    monkeypatch.setattr(settings, "USER_SEARCH_MAX_CANDIDATES", 2)
+
+    db = SessionLocal()
+    try:
+        users, _ = search_users(db, term, limit=10)
+    finally:
+        db.close()
+
+    # Created last, but still the best match
+    assert users[0].username == exact["username"]
+    assert len(users) < 6